@@ -4,36 +4,71 @@
 
 import sys
 import time
-import requests
-import subprocess
-from PyQt5.QtCore import Qt, QTimer, QRect, QPropertyAnimation, QEasingCurve
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QSizePolicy, QPushButton, QHBoxLayout
-from PyQt5.QtGui import QFont, QPainter, QColor, QBrush, QPainterPath
+import threading
+import importlib
+from PyQt5.QtCore import Qt, QObject, QTimer, QEvent, QStringListModel
+from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QSizePolicy, QPushButton, QHBoxLayout,
+                             QLineEdit, QShortcut, QGraphicsDropShadowEffect, QCompleter)
+from PyQt5.QtGui import QPainter, QColor, QKeySequence
+from weather_service import WeatherService
+from weather_scheduler import RefreshScheduler
+from hover import HoverTracker
+from launcher import AppLauncher
+from background import BackgroundRenderer
+from screen_geometry import GeometryManager, search_bubble_rect
+from bangs import BangResolver
+from search_history import SearchHistory
+from command_history import CommandHistory, HistoryNavigator
+from command_completion import CompletionIndex, common_prefix
+from theme import theme_from_env, stylesheet, font
+from island_modes import IslandModes, COLLAPSED, STANDARD, DETAILED, TERMINAL, SEARCH
+
+SUGGEST_DEBOUNCE_MS = 40  # pause in typing before search suggestions are looked up
+COMPLETION_LIST_MAX = 64  # candidates printed when Tab cannot complete any further
+
+# Not needed to show the notch trigger; imported on a background thread once the event loop
+# runs so the first weather fetch, launch or terminal command does not pay for them
+BACKGROUND_IMPORTS = ('http_client', 'subprocess', 'command_runner', 'scrollback', 'webbrowser')
+
+
+def preload_modules(names=BACKGROUND_IMPORTS):
+    def load():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"Preload of {name} failed: {e}")
+    thread = threading.Thread(target=load, name='island-preload', daemon=True)
+    thread.start()
+    return thread
+
 
 class DynamicIsland(QWidget):
-    def __init__(self):
+    def __init__(self, lazy_weather=False, profiler=None, panel_idle_ms=None, screen=None, geometry=None,
+                 weather_service=None, weather_scheduler=None, theme=None, bangs=None, search_history=None,
+                 command_history=None, command_index=None):
         super().__init__()
-        self.screen = QApplication.primaryScreen()
-        geometry = self.screen.geometry()
-        self.screen_width = geometry.width()
-        self.screen_height = geometry.height()
-        print(f"Screen size: {self.screen_width}x{self.screen_height}")
-
-        # --- Notch and Dynamic Island dimensions ---
-        self.notch_width = int(self.screen_width * 0.13)
-        self.notch_height = 30
-        self.notch_x = (self.screen_width - self.notch_width) // 2
-        self.notch_y = 0
-
-        self.island_width = int(self.notch_width * 2.2)
-        self.island_height = self.notch_height + 60
-        self.island_x = self.notch_x - int((self.island_width - self.notch_width) // 2)
-        self.island_y = 0
+        self.profiler = profiler
+        self.theme = theme or theme_from_env()
+        # --- Notch and Dynamic Island rectangles, cached per screen ---
+        # screen=None follows the primary screen
+        self.target_screen = screen
+        self.geometry_manager = geometry or GeometryManager(self)
+        self.rects = self.geometry_manager.layout(screen)
+        print(f"Screen size: {self.rects.screen.width()}x{self.rects.screen.height()}")
 
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setGeometry(self.island_x, self.island_y, self.island_width, self.island_height)
+        self.setGeometry(self.rects.notch)
         self.hide()
+        self.background = BackgroundRenderer(radius=32, color=self.theme.island_color)
+
+        # Collapsed, standard, detailed weather, terminal or search; owns the geometry animation
+        self.modes = IslandModes(self, lambda: self.rects)
+        self.modes.changed.connect(self.on_mode_changed)
+        self.modes.settled.connect(self.on_mode_settled)
+        if self.profiler:
+            self.profiler.watch_animation('island', self.modes.anim)
 
         # Layout for stacking labels
         layout = QVBoxLayout(self)
@@ -47,29 +82,49 @@ class DynamicIsland(QWidget):
         top_layout.setSpacing(0)
 
         self.clock = QLabel(self)
+        self.clock.setObjectName('islandClock')
         self.clock.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
-        self.clock.setFont(QFont('Arial', 20))
-        self.clock.setStyleSheet("color: white;")
+        self.clock.setFont(font(self.theme, 'clock'))
         top_layout.addWidget(self.clock)
         self.clock_timer = QTimer(self)
         self.clock_timer.timeout.connect(self.update_clock)
 
         self.weather = QLabel(self)
+        self.weather.setObjectName('islandWeather')
         self.weather.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
-        self.weather.setFont(QFont('Arial', 16))
-        self.weather.setStyleSheet("color: white;")
+        self.weather.setFont(font(self.theme, 'weather'))
         self.weather.setWordWrap(False)
         self.weather.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.weather.setText('Loading weather...')
         self.weather.setCursor(Qt.PointingHandCursor)  # Show clickable cursor
         self.weather.mousePressEvent = self.show_detailed_weather  # Attach click handler
         top_layout.addWidget(self.weather)
-        self.weather_timer = QTimer(self)
-        self.weather_timer.timeout.connect(self.update_weather)
-        self.weather_timer.start(600000)
-        self.update_weather()
-
-        self.detailed_weather_visible = False  # Track state
+        self.weather_snapshot = None
+        self.weather_unavailable = False
+        # Islands on other displays share one service and scheduler with the primary island
+        self.owns_weather = weather_service is None
+        self.weather_service = weather_service or WeatherService(self)
+        self.weather_service.snapshot_ready.connect(self.on_weather_snapshot)
+        # Refreshes follow visibility: fresh while open, backing off while hidden or failing
+        self.weather_scheduler = weather_scheduler or RefreshScheduler(self, fresh_for=self.weather_service.cache.ttl)
+        self.weather_scheduler.rescheduled.connect(self.on_weather_rescheduled)
+        if self.owns_weather:
+            self.weather_service.refresh_finished.connect(self.on_weather_refresh_finished)
+            self.weather_scheduler.refresh.connect(self.update_weather)
+            # Let a fetch still running at quit finish (or time out) before the app goes away
+            QApplication.instance().aboutToQuit.connect(self.weather_service.shutdown)
+            # Show the last known weather immediately; the background refresh replaces it
+            persisted = self.weather_service.load_persisted()
+            if persisted is not None:
+                self.weather_scheduler.note_success_age(persisted.age())
+                self.on_weather_snapshot(persisted)
+            # Never fetch inside the constructor: either right after the event loop starts
+            # or, in lazy mode, the first time the island is revealed
+            if not lazy_weather:
+                QTimer.singleShot(0, self.weather_scheduler.start)
+        elif self.weather_service.current() is not None:
+            self.on_weather_snapshot(self.weather_service.current())
+        QTimer.singleShot(0, preload_modules)
 
         layout.addWidget(top_bar)
 
@@ -79,20 +134,15 @@ class DynamicIsland(QWidget):
         self.bottom_layout.setContentsMargins(10, 5, 10, 5)
         self.bottom_layout.setSpacing(10)
 
-        # Terminal emoji widget
-        self.terminal_btn = QLabel("🖥️", self)
-        self.terminal_btn.setFont(QFont('Arial', 20))
-        self.terminal_btn.setStyleSheet("color: white; padding: 4px; border-radius: 8px;")
-        self.terminal_btn.setAlignment(Qt.AlignCenter)
-        self.terminal_btn.setFixedSize(32, 32)
-        self.terminal_btn.setAttribute(Qt.WA_Hover)
-        self.bottom_layout.addWidget(self.terminal_btn)
+        # Quick-launch apps share one debounced launcher; hover dwells launch, clicks launch now
+        self.launcher = AppLauncher(self)
+        self.quick_launch_apps = {}
+        self.terminal_btn = self.add_quick_launch("🖥️", 'Terminal')
 
         # Internet emoji widget (use QPushButton for better event handling)
-        from PyQt5.QtWidgets import QPushButton
         self.internet_btn = QPushButton("🌐", self)
-        self.internet_btn.setFont(QFont('Arial', 20))
-        self.internet_btn.setStyleSheet("color: white; background: transparent; border: none; padding: 4px; border-radius: 8px;")
+        self.internet_btn.setObjectName('internetButton')
+        self.internet_btn.setFont(font(self.theme, 'icon'))
         self.internet_btn.setFixedSize(32, 32)
         self.internet_btn.setCursor(Qt.PointingHandCursor)
         self.bottom_layout.addWidget(self.internet_btn)
@@ -102,12 +152,90 @@ class DynamicIsland(QWidget):
         # Example: self.bottom_layout.addWidget(QLabel("⭐", self))
 
         layout.addWidget(self.bottom_bar)
+        # One compiled stylesheet for the whole island, applied once
+        self.setStyleSheet(stylesheet(self.theme))
+
+        # --- Terminal interface and search bubble are built on first use ---
+        self.panel_idle_ms = panel_idle_ms
+        self.panel_build_ms = {}
+        self.terminal_widget = None
+        self.search_bubble = None
+        self.panel_idle_timers = {}
+        # !bangs resolve locally; the index is loaded when the search bubble is first built.
+        # Islands on other displays share both, so one history file has one writer
+        self.bangs = bangs if bangs is not None else BangResolver()
+        self.search_history = search_history if search_history is not None else SearchHistory()
+        # Terminal history and Tab completion outlive the terminal panel; both load in the background
+        # and, like search history, are shared by the islands on other displays
+        self.command_history = command_history if command_history is not None else CommandHistory()
+        self.command_index = command_index if command_index is not None else CompletionIndex()
+
+        self.is_mouse_over = False
+        self.hide_delay_timer = QTimer(self)
+        self.hide_delay_timer.setSingleShot(True)
+        self.hide_delay_timer.timeout.connect(self.animate_hide)
+        # No cursor polling while hidden; the notch trigger window reports hover instead
+        self.hover = HoverTracker(self.rects.notch, self)
+        self.hover.notch_entered.connect(self.on_notch_entered)
+        self.hover.poll.connect(self.check_mouse)
+        self.hover.watch_notch()
+
+        # Follow resolution changes and hot-plugged or re-arranged displays
+        self.geometry_manager.layout_changed.connect(self.on_layout_changed)
+        self.geometry_manager.screens_changed.connect(self.relayout)
+
+    def add_quick_launch(self, emoji, app):
+        btn = QLabel(emoji, self)
+        btn.setObjectName('quickLaunch')
+        btn.setFont(font(self.theme, 'icon'))
+        btn.setAlignment(Qt.AlignCenter)
+        btn.setFixedSize(32, 32)
+        btn.setAttribute(Qt.WA_Hover)
+        self.quick_launch_apps[btn] = app
+        btn.installEventFilter(self)
+        self.bottom_layout.addWidget(btn)
+        return btn
+
+    def eventFilter(self, obj, event):
+        app = self.quick_launch_apps.get(obj)
+        if app is not None:
+            if event.type() == QEvent.Enter:
+                self.launcher.request(app)
+            elif event.type() == QEvent.Leave:
+                self.launcher.cancel(app)
+            elif event.type() == QEvent.MouseButtonPress:
+                self.launcher.launch_now(app)
+            return super().eventFilter(obj, event)
+        if obj == self.internet_btn:
+            if event.type() == QEvent.Enter:
+                self.show_search_bar()
+            elif event.type() == QEvent.Leave:
+                self.hide_search_bar()
+        elif self.terminal_widget is not None and obj is self.terminal_input:
+            if event.type() == QEvent.KeyPress and self.on_terminal_key(event):
+                return True
+            if (event.type() == QEvent.ShortcutOverride and self.reverse_search is not None
+                    and event.key() == Qt.Key_Escape):
+                # Escape leaves the reverse search instead of cancelling running commands
+                event.accept()
+                return True
+        return super().eventFilter(obj, event)
 
-        # --- Terminal interface (hidden by default) ---
+    def ensure_terminal(self):
+        # Terminal UI is only built the first time terminal mode is opened
+        if self.terminal_widget is None:
+            start = time.perf_counter()
+            self.build_terminal()
+            self.panel_build_ms['terminal'] = (time.perf_counter() - start) * 1000
+        return self.terminal_widget
+
+    def build_terminal(self):
+        from command_runner import CommandRunner
+        from scrollback import ScrollbackModel, ScrollbackView
         self.terminal_widget = QWidget(self)
-        self.terminal_widget.setStyleSheet("background: #111; border-radius: 8px; border: 1px solid #222;")
+        self.terminal_widget.setObjectName('terminalPanel')
         self.terminal_widget.setMinimumSize(400, 160)
-        self.terminal_widget.setMaximumSize(self.screen_width, self.screen_height)
+        self.terminal_widget.setMaximumSize(self.rects.screen.size())
         self.terminal_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.terminal_widget.setWindowFlags(Qt.SubWindow | Qt.FramelessWindowHint)
         self.terminal_widget.setMouseTracking(True)
@@ -120,39 +248,77 @@ class DynamicIsland(QWidget):
         self.terminal_layout.setSpacing(8)
         self.terminal_layout.setAlignment(Qt.AlignTop)
 
-        self.terminal_output = QLabel("", self.terminal_widget)
-        self.terminal_output.setFont(QFont('Arial', 14))
-        self.terminal_output.setStyleSheet("color: #00FF00; background: #222; border-radius: 4px; padding: 8px; border: 1px solid #333;")
-        self.terminal_output.setWordWrap(True)
-        self.terminal_output.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        # Bounded scrollback; only the visible lines are laid out
+        self.terminal_scrollback = ScrollbackModel(parent=self)
+        self.terminal_output = ScrollbackView(self.terminal_scrollback, self.terminal_widget)
+        self.terminal_output.setObjectName('terminalOutput')
+        self.terminal_output.setFont(font(self.theme, 'terminal'))
         self.terminal_output.setMinimumHeight(80)
         self.terminal_layout.addWidget(self.terminal_output)
 
-        from PyQt5.QtWidgets import QLineEdit, QPushButton
+        # Shows the query while Ctrl+R searches the command history
+        self.terminal_search_label = QLabel(self.terminal_widget)
+        self.terminal_search_label.setObjectName('terminalSearch')
+        self.terminal_search_label.setFont(font(self.theme, 'terminal'))
+        self.terminal_search_label.hide()
+        self.terminal_layout.addWidget(self.terminal_search_label)
+
         self.terminal_input = QLineEdit(self.terminal_widget)
-        self.terminal_input.setFont(QFont('Arial', 14))
-        self.terminal_input.setStyleSheet("color: #00FF00; background: #222; border-radius: 4px; padding: 8px; border: 1px solid #333;")
+        self.terminal_input.setObjectName('terminalInput')
+        self.terminal_input.setFont(font(self.theme, 'terminal'))
         self.terminal_input.setAlignment(Qt.AlignLeft)
         self.terminal_input.setMinimumHeight(32)
         self.terminal_layout.addWidget(self.terminal_input)
         self.terminal_input.returnPressed.connect(self.run_terminal_command)
 
+        # Up/Down walk the history, Ctrl+R searches it, Tab completes commands and paths
+        self.terminal_history = HistoryNavigator(self.command_history)
+        self.reverse_search = None   # the query while a reverse search is active
+        self.reverse_match = None
+        self.reverse_draft = ''
+        self.terminal_input.textEdited.connect(lambda text: self.terminal_history.reset())
+        self.terminal_input.installEventFilter(self)
+        self.command_history.load_in_background()
+
+        # Commands run asynchronously and stream into terminal_output; Escape cancels them
+        self.command_runner = CommandRunner(self)
+        self.command_runner.output.connect(self.on_command_output)
+        self.command_runner.finished.connect(self.on_command_finished)
+        QApplication.instance().aboutToQuit.connect(self.command_runner.shutdown)
+        cancel_shortcut = QShortcut(QKeySequence(Qt.Key_Escape), self.terminal_widget)
+        cancel_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        cancel_shortcut.activated.connect(self.command_runner.cancel)
+
         # Back button to return to standard island
         self.back_btn = QPushButton("⬅️ Back", self.terminal_widget)
-        self.back_btn.setStyleSheet("color: white; background: #333; border-radius: 6px; padding: 6px; border: none;")
+        self.back_btn.setObjectName('terminalBack')
         self.back_btn.setFixedWidth(80)
         self.back_btn.clicked.connect(self.show_standard_island)
         self.terminal_layout.addWidget(self.back_btn, alignment=Qt.AlignRight)
 
         self.terminal_widget.hide()
-        layout.addWidget(self.terminal_widget, alignment=Qt.AlignCenter)
+        self.layout().addWidget(self.terminal_widget, alignment=Qt.AlignCenter)
+
+        # Enable resizing from bottom right corner
+        self.terminal_widget.grabbed = False
+        self.terminal_widget.old_pos = None
+        self.terminal_widget.installEventFilter(self)
 
-        # --- Search bubble (hidden by default) ---
-        from PyQt5.QtWidgets import QLineEdit, QGraphicsDropShadowEffect
+    def ensure_search_bubble(self):
+        if self.search_bubble is None:
+            start = time.perf_counter()
+            self.build_search_bubble()
+            self.panel_build_ms['search'] = (time.perf_counter() - start) * 1000
+        return self.search_bubble
+
+    def build_search_bubble(self):
         self.search_bubble = QWidget(None)
         self.search_bubble.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.search_bubble.setObjectName('searchBubble')
         self.search_bubble.setAttribute(Qt.WA_TranslucentBackground)
-        self.search_bubble.setStyleSheet("background: #000; border-radius: 24px; border: 1px solid #333;")
+        self.search_bubble.setAttribute(Qt.WA_StyledBackground, True)
+        # A separate top-level window, so it gets its own copy of the island's stylesheet
+        self.search_bubble.setStyleSheet(stylesheet(self.theme))
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(18)
         shadow.setColor(QColor(0,0,0,180))
@@ -161,161 +327,327 @@ class DynamicIsland(QWidget):
         bubble_layout = QVBoxLayout(self.search_bubble)
         bubble_layout.setContentsMargins(16, 16, 16, 16)
         self.search_bar = QLineEdit(self.search_bubble)
-        self.search_bar.setFont(QFont('Arial', 14))
-        self.search_bar.setStyleSheet("color: white; background: transparent; border: none;")
+        self.search_bar.setObjectName('searchBar')
+        self.search_bar.setFont(font(self.theme, 'search'))
         self.search_bar.setPlaceholderText("Type to search...")
         bubble_layout.addWidget(self.search_bar)
         self.search_bubble.hide()
         self.search_bar.returnPressed.connect(self.launch_search)
-
-        # --- Enable resizing from bottom right corner ---
-        self.terminal_widget.grabbed = False
-        self.terminal_widget.old_pos = None
-        self.terminal_widget.installEventFilter(self)
-        self.terminal_btn.installEventFilter(self)
-
-        # Ensure mouse tracking and hover logic for main island
-        self.anim = QPropertyAnimation(self, b"geometry")
-        self.anim.setDuration(350)
-        self.anim.setEasingCurve(QEasingCurve.OutCubic)
-
-        self.search_anim = QPropertyAnimation(self, b"geometry")
-        self.search_anim.setDuration(350)
-        self.search_anim.setEasingCurve(QEasingCurve.OutCubic)
-
-        self.is_mouse_over = False
-        self.mouse_timer = QTimer(self)
-        self.mouse_timer.timeout.connect(self.check_mouse)
-        self.hide_delay_timer = QTimer(self)
-        self.hide_delay_timer.setSingleShot(True)
-        self.hide_delay_timer.timeout.connect(self.animate_hide)
-        self.mouse_timer.start(50)
-
-    def eventFilter(self, obj, event):
-        from PyQt5.QtCore import QEvent
-        if obj == self.terminal_btn:
-            if event.type() == QEvent.Enter:
-                import subprocess
-                subprocess.Popen(['open', '-a', 'Terminal'])
-            elif event.type() == QEvent.MouseButtonPress:
-                import subprocess
-                subprocess.Popen(['open', '-a', 'Terminal'])
-        if obj == self.internet_btn:
-            if event.type() == QEvent.Enter:
-                self.show_search_bar()
-            elif event.type() == QEvent.Leave:
-                self.hide_search_bar()
-        return super().eventFilter(obj, event)
+        self.bangs.load()
+
+        # Past searches complete inline, best frecency first, once typing pauses
+        self.search_suggestions = QStringListModel(self.search_bubble)
+        self.search_completer = QCompleter(self.search_suggestions, self.search_bar)
+        self.search_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.search_completer.setCompletionMode(QCompleter.InlineCompletion)
+        self.search_bar.setCompleter(self.search_completer)
+        self.search_prefix = ''
+        self.suggest_timer = QTimer(self.search_bubble)
+        self.suggest_timer.setSingleShot(True)
+        self.suggest_timer.setInterval(SUGGEST_DEBOUNCE_MS)
+        self.suggest_timer.timeout.connect(self.update_search_suggestions)
+        self.search_bar.textEdited.connect(self.on_search_edited)
+        # A long history takes a few tens of ms to replay, so do it off the GUI thread; until it is
+        # done suggestions are empty rather than waiting for it
+        self.search_history.load_in_background()
+
+    def schedule_panel_teardown(self, name):
+        # Optionally free a hidden panel after panel_idle_ms; it is rebuilt on next use
+        if not self.panel_idle_ms:
+            return
+        timer = self.panel_idle_timers.get(name)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self.teardown_panel(name))
+            self.panel_idle_timers[name] = timer
+        timer.start(self.panel_idle_ms)
+
+    def cancel_panel_teardown(self, name):
+        timer = self.panel_idle_timers.get(name)
+        if timer is not None:
+            timer.stop()
+
+    def teardown_panel(self, name):
+        if name == 'terminal' and self.terminal_widget is not None:
+            if self.terminal_widget.isVisible() or self.command_runner.running():
+                return
+            self.terminal_widget.deleteLater()
+            self.terminal_scrollback.deleteLater()
+            self.command_runner.deleteLater()
+            self.terminal_widget = None
+        elif name == 'search' and self.search_bubble is not None:
+            if self.search_bubble.isVisible():
+                return
+            self.search_bubble.deleteLater()
+            self.search_bubble = None
 
     def show_terminal_island(self):
-        if not self.is_terminal_mode:
-            self.is_terminal_mode = True
-            self.animate_terminal_expand()
-            self.terminal_widget.show()
-            self.bottom_bar.hide()
-            self.clock.hide()
-            self.weather.hide()
+        self.modes.set_mode(TERMINAL)
 
     def show_standard_island(self):
-        if self.is_terminal_mode:
-            self.is_terminal_mode = False
-            self.animate_terminal_collapse()
+        if self.modes.mode == TERMINAL:
+            self.modes.set_mode(STANDARD)
+
+    def on_mode_changed(self, old, new):
+        # Swaps the island's contents; the shape change itself is animated by self.modes
+        if old == COLLAPSED:
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            self.clock_timer.start(1000)
+            self.refresh_weather_label()  # keep the staleness marker current
+            self.weather_scheduler.island_shown(self)
+            self.hover.pause()
+        elif new == COLLAPSED:
+            self.clock_timer.stop()
+        if old == SEARCH:
+            self.search_bubble.hide()
+            self.schedule_panel_teardown('search')
+        # Search keeps the contents of the mode it was opened from
+        shown, showing = self.modes.underlying(old), self.modes.underlying(new)
+        if shown != showing:
+            self.leave_contents(shown)
+            self.enter_contents(showing)
+        if new == SEARCH:
+            self.ensure_search_bubble()
+            self.cancel_panel_teardown('search')
+            # Hangs below whatever shape the island keeps while searching
+            self.search_bubble.setGeometry(search_bubble_rect(self.modes.rect_for(SEARCH)))
+            self.search_bubble.show()
+            self.search_bar.setFocus()
+
+    def leave_contents(self, mode):
+        if mode == TERMINAL:
+            self.end_reverse_search()
             self.terminal_widget.hide()
+            self.schedule_panel_teardown('terminal')
             self.bottom_bar.show()
             self.clock.show()
             self.weather.show()
+        elif mode == DETAILED:
+            self.set_weather_detailed(False)
+
+    def enter_contents(self, mode):
+        if mode == TERMINAL:
+            self.ensure_terminal()
+            self.cancel_panel_teardown('terminal')
+            # Only $PATH directories that changed since the last visit are re-read
+            self.command_index.refresh_in_background()
+            self.terminal_widget.show()
+            self.bottom_bar.hide()
+            self.clock.hide()
+            self.weather.hide()
+        elif mode == DETAILED:
+            self.set_weather_detailed(True)
+            self.weather_scheduler.refresh_if_stale()
 
-    def animate_terminal_expand(self):
-        # Animate to a larger geometry for terminal mode
-        new_height = self.island_height + 120
-        new_rect = QRect(self.island_x, self.island_y, self.island_width, new_height)
-        self.anim.stop()
-        self.anim.setStartValue(self.geometry())
-        self.anim.setEndValue(new_rect)
-        self.anim.start()
-        self.setGeometry(new_rect)
-
-    def animate_terminal_collapse(self):
-        # Animate back to original geometry
-        orig_rect = QRect(self.island_x, self.island_y, self.island_width, self.island_height)
-        self.anim.stop()
-        self.anim.setStartValue(self.geometry())
-        self.anim.setEndValue(orig_rect)
-        self.anim.start()
-        self.setGeometry(orig_rect)
+    def on_mode_settled(self, mode):
+        if mode == COLLAPSED:
+            self.hide_island()
+        else:
+            self.hover.watch_island()
 
     def run_terminal_command(self):
         cmd = self.terminal_input.text()
         if not cmd.strip():
             return
-        try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5)
-            output = result.stdout if result.stdout else result.stderr
-        except Exception as e:
-            output = str(e)
-        self.terminal_output.setText(output)
+        if not self.command_runner.running():
+            self.terminal_scrollback.clear()
+        if self.command_runner.run(cmd) is None:
+            self.append_terminal_output("Too many commands running\n")
+            return
+        self.append_terminal_output(f"$ {cmd}\n")
+        self.command_history.add(cmd)
+        self.terminal_history.reset()
         self.terminal_input.clear()
 
+    def append_terminal_output(self, text):
+        self.terminal_scrollback.append(text)
+
+    def on_command_output(self, job_id, text, is_stderr):
+        self.append_terminal_output(text)
+
+    def on_command_finished(self, job_id, exit_code, status):
+        if status == 'timeout':
+            self.append_terminal_output("[timed out]\n")
+        elif status == 'cancelled':
+            self.append_terminal_output("[cancelled]\n")
+
+    def on_terminal_key(self, event):
+        # Returns True when the key was handled here and must not reach the line edit
+        key = event.key()
+        if key == Qt.Key_R and event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier):
+            self.reverse_search_step()
+            return True
+        if self.reverse_search is not None:
+            return self.on_reverse_search_key(event)
+        if key in (Qt.Key_Up, Qt.Key_Down):
+            text = (self.terminal_history.older(self.terminal_input.text()) if key == Qt.Key_Up
+                    else self.terminal_history.newer())
+            if text is not None:
+                self.terminal_input.setText(text)
+            return True
+        if key == Qt.Key_Tab:
+            self.complete_terminal_input()
+            return True
+        return False
+
+    def complete_terminal_input(self):
+        text = self.terminal_input.text()
+        cursor = self.terminal_input.cursorPosition()
+        start, candidates = self.command_index.complete(text, cursor)
+        if not candidates:
+            return
+        if len(candidates) == 1:
+            completion = candidates[0] if candidates[0].endswith('/') else candidates[0] + ' '
+        else:
+            completion = common_prefix(candidates)
+            if len(completion) <= cursor - start:
+                # Nothing more in common: list the candidates, like a shell's second Tab
+                shown = '  '.join(candidates[:COMPLETION_LIST_MAX])
+                more = len(candidates) - COMPLETION_LIST_MAX
+                self.append_terminal_output(shown + (f"  ... and {more} more" if more > 0 else '') + '\n')
+                return
+        self.terminal_input.setText(text[:start] + completion + text[cursor:])
+        self.terminal_input.setCursorPosition(start + len(completion))
+
+    def reverse_search_step(self):
+        # Ctrl+R starts a reverse search; pressed again it finds the next older match
+        if self.reverse_search is None:
+            self.reverse_search = ''
+            self.reverse_match = None
+            self.reverse_draft = self.terminal_input.text()
+            self.update_reverse_search()
+        elif self.reverse_search:
+            self.update_reverse_search(self.reverse_match)
+
+    def on_reverse_search_key(self, event):
+        key = event.key()
+        if key in (Qt.Key_Shift, Qt.Key_Control, Qt.Key_Meta, Qt.Key_Alt, Qt.Key_AltGr):
+            return False  # a modifier on its own, e.g. the Ctrl of the next Ctrl+R
+        if key == Qt.Key_Escape:
+            self.end_reverse_search(restore=True)
+            return True
+        if key == Qt.Key_Backspace:
+            self.reverse_search = self.reverse_search[:-1]
+            self.update_reverse_search()
+            return True
+        text = event.text()
+        if text and text.isprintable():
+            self.reverse_search += text
+            # The current match may still match the longer query
+            self.update_reverse_search(None if self.reverse_match is None else self.reverse_match + 1)
+            return True
+        # Enter runs the match; arrows, Tab and the rest accept it and act as usual
+        self.end_reverse_search()
+        return False
+
+    def update_reverse_search(self, before=None):
+        query = self.reverse_search
+        index = self.command_history.search(query, before) if query else None
+        if index is not None:
+            self.reverse_match = index
+            self.terminal_input.setText(self.command_history[index])
+        elif not query:
+            self.reverse_match = None
+            self.terminal_input.setText(self.reverse_draft)
+        failed = 'failed ' if query and index is None else ''
+        self.terminal_search_label.setText(f"({failed}reverse-i-search)`{query}':")
+        self.terminal_search_label.show()
+
+    def end_reverse_search(self, restore=False):
+        if self.reverse_search is None:
+            return
+        if restore:
+            self.terminal_input.setText(self.reverse_draft)
+        self.reverse_search = None
+        self.reverse_match = None
+        self.terminal_search_label.hide()
+        self.terminal_history.reset()
+
+    def set_theme(self, theme):
+        # Re-styles each window once; nothing is re-polished on hover or mode changes
+        self.theme = theme
+        self.background.set_color(theme.island_color)
+        self.setStyleSheet(stylesheet(theme))
+        self.clock.setFont(font(theme, 'clock'))
+        self.weather.setFont(font(theme, 'weather_detail' if self.modes.underlying() == DETAILED else 'weather'))
+        for btn in (*self.quick_launch_apps, self.internet_btn):
+            btn.setFont(font(theme, 'icon'))
+        if self.terminal_widget is not None:
+            self.terminal_output.setFont(font(theme, 'terminal'))
+            self.terminal_input.setFont(font(theme, 'terminal'))
+            self.terminal_search_label.setFont(font(theme, 'terminal'))
+        if self.search_bubble is not None:
+            self.search_bubble.setStyleSheet(stylesheet(theme))
+            self.search_bar.setFont(font(theme, 'search'))
+        self.update()
+
+    def on_layout_changed(self, screen):
+        if screen is (self.target_screen or self.geometry_manager.primary()):
+            self.relayout()
+
+    def relayout(self):
+        # Moves every part of the island to the cached layout of its screen, keeping its shape
+        rects = self.geometry_manager.layout(self.target_screen)
+        if rects == self.rects:
+            return
+        self.rects = rects
+        self.hover.set_notch_rect(rects.notch)
+        if self.terminal_widget is not None:
+            self.terminal_widget.setMaximumSize(rects.screen.size())
+        self.modes.relayout()
+        if self.search_bubble is not None and self.search_bubble.isVisible():
+            self.search_bubble.setGeometry(search_bubble_rect(self.modes.rect_for(SEARCH)))
+
+    def dispose(self):
+        # For islands removed at runtime, e.g. when their display is unplugged
+        self.weather_scheduler.island_hidden(self)
+        self.hover.close()
+        if self.search_bubble is not None:
+            self.search_bubble.deleteLater()
+        self.deleteLater()
+
     def paintEvent(self, event):
+        start = time.perf_counter()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        radius = 32
-        # Use current widget size for background
-        width = self.width()
-        height = self.height()
-        path.addRoundedRect(0, 0, width, height, radius, radius)
-        painter.fillPath(path, QBrush(QColor(0, 0, 0)))
+        # Use current widget size for background; the renderer caches per size
+        self.background.paint(painter, self.width(), self.height(), self.devicePixelRatioF())
+        if self.profiler:
+            painter.end()
+            self.profiler.record_paint('island paint', start, time.perf_counter())
 
     def update_clock(self):
         self.clock.setText(time.strftime('%H:%M:%S'))
 
     def update_weather(self):
-        import time
-        try:
-            # Add cache-busting timestamp to the URL
-            ts = int(time.time())
-            resp = requests.get(f'https://wttr.in/?format=3&t={ts}', timeout=5)
-            print(f"Weather response: {resp.text}")
-            if resp.status_code == 200 and resp.text.strip():
-                import re
-                # Match temperature (e.g. 23°C or -5°F) and any emoji
-                temp_match = re.search(r'(-?\d+\s*°[CF])', resp.text)
-                emoji_match = re.search(r'([\U0001F300-\U0001FAFF\u2600-\u26FF])', resp.text)
-                if temp_match and emoji_match:
-                    temp = temp_match.group(1)
-                    emoji = emoji_match.group(1)
-                    self.weather.setText(f"{temp} {emoji}")
-                else:
-                    self.weather.setText('Weather unavailable')
-            else:
-                # Also add cache-busting to fallback
-                fallback = requests.get(f'https://wttr.in/Pittsburgh?format=3&t={ts}', timeout=5)
-                if fallback.status_code == 200 and fallback.text.strip():
-                    import re
-                    temp_match = re.search(r'(-?\d+\s*°[CF])', fallback.text)
-                    emoji_match = re.search(r'([\U0001F300-\U0001FAFF\u2600-\u26FF])', fallback.text)
-                    if temp_match and emoji_match:
-                        temp = temp_match.group(1)
-                        emoji = emoji_match.group(1)
-                        self.weather.setText(f"{temp} {emoji}")
-                    else:
-                        self.weather.setText('Weather unavailable')
-                else:
-                    self.weather.setText('Weather unavailable')
-        except Exception as e:
-            print(f"Weather error: {e}")
-            self.weather.setText('Weather unavailable')
+        # Fetch runs in the background; on_weather_snapshot updates the label
+        self.weather_service.request_snapshot()
+
+    def on_weather_refresh_finished(self, ok):
+        self.weather_scheduler.record_result(ok, self.weather_service.providers.retry_in())
+
+    def on_weather_rescheduled(self):
+        # Hovering the weather shows when it will refresh next, for debugging
+        self.weather.setToolTip(self.weather_scheduler.status_text())
+
+    def on_notch_entered(self):
+        if not self.is_mouse_over:
+            self.is_mouse_over = True
+            self.animate_show()
+        self.hide_delay_timer.stop()
 
     def check_mouse(self):
+        # Only polled while the island is open
         pos = QApplication.instance().desktop().cursor().pos()
         # Use global geometry for the island and terminal widget
         island_rect = self.frameGeometry()
-        terminal_rect = self.terminal_widget.frameGeometry() if self.terminal_widget.isVisible() else None
+        terminal_visible = self.terminal_widget is not None and self.terminal_widget.isVisible()
+        terminal_rect = self.terminal_widget.frameGeometry() if terminal_visible else None
         in_island = island_rect.contains(pos)
         in_terminal = terminal_rect and terminal_rect.contains(pos)
-        in_notch = (self.notch_x <= pos.x() <= self.notch_x + self.notch_width and
-                    self.notch_y <= pos.y() <= self.notch_y + self.notch_height)
+        in_notch = self.rects.notch.contains(pos)
         # Only trigger opening if mouse is inside the notch
         if in_notch or (self.isVisible() and (in_island or in_terminal)):
             if not self.is_mouse_over:
@@ -329,139 +661,114 @@ class DynamicIsland(QWidget):
                 self.hide_delay_timer.start(1500)
 
     def animate_show(self):
-        self.show()
-        self.raise_()
-        self.activateWindow()
-        self.clock_timer.start(1000)
-        self.mouse_timer.stop()
-        start_rect = QRect(self.notch_x, self.notch_y, self.notch_width, self.notch_height)
-        end_rect = QRect(self.island_x, self.island_y, self.island_width, self.island_height)
-        self.anim.stop()
-        self.anim.setStartValue(start_rect)
-        self.anim.setEndValue(end_rect)
-        self.anim.finished.connect(self.on_show_animation_finished)
-        self.anim.start()
-
-    def on_show_animation_finished(self):
-        self.mouse_timer.start(50)
-        try:
-            self.anim.finished.disconnect(self.on_show_animation_finished)
-        except Exception:
-            pass
+        # Opening while a collapse is under way turns it around from where the island is
+        if self.modes.mode == COLLAPSED:
+            self.modes.set_mode(STANDARD)
 
     def animate_hide(self):
-        self.clock_timer.stop()
-        start_rect = QRect(self.island_x, self.island_y, self.island_width, self.island_height)
-        end_rect = QRect(self.notch_x, self.notch_y, self.notch_width, self.notch_height)
-        self.anim.stop()
-        self.anim.setStartValue(start_rect)
-        self.anim.setEndValue(end_rect)
-        self.anim.finished.connect(self.hide_island)
-        self.anim.start()
+        self.modes.set_mode(COLLAPSED)
 
     def hide_island(self):
         super().hide()
-        try:
-            self.anim.finished.disconnect(self.hide_island)
-        except Exception:
-            pass
+        self.hover.watch_notch()
+        self.weather_scheduler.island_hidden(self)
 
     def show_search_bar(self):
-        # Position bubble below the current island geometry
-        island_rect = self.geometry()
-        bubble_width = island_rect.width() - 40
-        bubble_height = 56
-        bubble_x = island_rect.x() + 25
-        bubble_y = island_rect.y() + island_rect.height() - 12  # removing some padding space here because im a trash developer
-        self.search_bubble.setGeometry(bubble_x, bubble_y, bubble_width, bubble_height)
-        # Set black rounded background with padding and border for visibility
-        self.search_bubble.setStyleSheet("background-color: #111; border-radius: 24px; border: 2px solid #222; padding: 8px;")
-        # Make the search bar fill the bubble and have rounded corners
-        self.search_bar.setStyleSheet("color: white; background: #000; border-radius: 16px; border: none; padding: 10px 16px; font-size: 16px;")
-        self.search_bubble.setAttribute(Qt.WA_StyledBackground, True)
-        self.search_bubble.setAttribute(Qt.WA_TranslucentBackground, True)
-        self.search_bubble.show()
-        self.search_bar.setFocus()
+        self.modes.set_mode(SEARCH)
 
     def hide_search_bar(self):
-        self.search_bubble.hide()
+        if self.modes.mode == SEARCH:
+            self.modes.set_mode(self.modes.search_from)
+
+    def on_search_edited(self, text):
+        # Typing further refreshes the inline completion; deleting must not bring it back
+        extending = len(text) > len(self.search_prefix)
+        self.search_prefix = text
+        if extending:
+            self.suggest_timer.start()
+        else:
+            self.suggest_timer.stop()
+
+    def update_search_suggestions(self):
+        prefix = self.search_prefix
+        if not self.search_bar.text().lower().startswith(prefix.lower()):
+            return
+        self.search_suggestions.setStringList(self.search_history.suggest(prefix))
+        self.search_completer.setCompletionPrefix(prefix)
+        self.search_completer.complete()
 
     def launch_search(self):
         import webbrowser
         query = self.search_bar.text().strip()
         if query:
-            url = f"https://bangathome.free.nf/?q={query.replace(' ', '+')}"
-            webbrowser.open(url)
+            self.search_history.record(query)
+            # Known bangs open their destination directly; the rest go to the remote engine
+            webbrowser.open(self.bangs.url_for(query))
+        self.search_prefix = ''
         self.search_bar.clear()
         self.hide_search_bar()
 
     def show_detailed_weather(self, event):
-        if not self.detailed_weather_visible:
-            # Expand Dynamic Island for detailed weather
-            expanded_height = self.island_height + 80
-            expanded_rect = QRect(self.island_x, self.island_y, self.island_width, expanded_height)
-            self.anim.stop()
-            self.anim.setStartValue(self.geometry())
-            self.anim.setEndValue(expanded_rect)
-            self.anim.start()
-            self.setGeometry(expanded_rect)
-            self.weather.setFont(QFont('Arial', 16, QFont.Bold))
-            self.weather.setText(self.get_detailed_weather())
-            self.weather.setWordWrap(True)
-            self.detailed_weather_visible = True
-        else:
-            # Collapse Dynamic Island back to original size
-            orig_rect = QRect(self.island_x, self.island_y, self.island_width, self.island_height)
-            self.anim.stop()
-            self.anim.setStartValue(self.geometry())
-            self.anim.setEndValue(orig_rect)
-            self.anim.start()
-            self.setGeometry(orig_rect)
-            self.weather.setFont(QFont('Arial', 16))
-            self.weather.setText(self.get_weather_summary())
-            self.weather.setWordWrap(False)
-            self.detailed_weather_visible = False
-
-    def get_detailed_weather(self):
-        # Example: get latest weather and emoji
-        try:
-            resp = requests.get('https://wttr.in/?format=3', timeout=5)
-            if resp.status_code == 200 and resp.text.strip():
-                import re
-                temp_match = re.search(r'(-?\d+\s*°[CF])', resp.text)
-                emoji_match = re.search(r'([\U0001F300-\U0001FAFF\u2600-\u26FF])', resp.text)
-                temp = temp_match.group(1) if temp_match else "N/A"
-                emoji = emoji_match.group(1) if emoji_match else ""
-
-
-                resp = requests.get('https://wttr.in/?format=j1', timeout=5)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    temp = data['current_condition'][0]['temp_C']
-                    humidity = data['current_condition'][0]['humidity']
-                    wind = data['current_condition'][0]['windspeedKmph']
-                    desc = data['current_condition'][0]['weatherDesc'][0]['value']
-                    details = f"Temperature: {temp}°C\nHumidity: {humidity}%\nWind: {wind} km/h\nForecast: {desc}"
-                return details
+        # Clicking the weather toggles between the compact and detailed views
+        self.modes.set_mode(STANDARD if self.modes.underlying() == DETAILED else DETAILED)
+
+    def set_weather_detailed(self, detailed):
+        self.weather.setFont(font(self.theme, 'weather_detail' if detailed else 'weather'))
+        self.weather.setWordWrap(detailed)
+        self.refresh_weather_label()
+
+    def on_weather_snapshot(self, snapshot):
+        # A failed refresh keeps showing the last snapshot (marked stale) instead of "unavailable"
+        if snapshot is not None:
+            self.weather_snapshot = snapshot
+        self.weather_unavailable = self.weather_snapshot is None
+        self.refresh_weather_label()
+
+    def refresh_weather_label(self):
+        # Compact and detailed views are both rendered from the latest snapshot
+        snapshot = self.weather_snapshot
+        stale_after = self.weather_service.cache.ttl
+        if self.modes.underlying() == DETAILED:
+            if snapshot is not None:
+                self.weather.setText(snapshot.details_text(stale_after))
+            elif self.weather_unavailable:
+                self.weather.setText("Detailed Weather Report:\nWeather unavailable")
             else:
-                return "Detailed Weather Report:\nWeather unavailable"
-        except Exception:
-            return "Detailed Weather Report:\nWeather unavailable"
-
-    def get_weather_summary(self):
-        # Get latest weather and emoji for summary
-        try:
-            resp = requests.get('https://wttr.in/?format=3', timeout=5)
-            if resp.status_code == 200 and resp.text.strip():
-                import re
-                temp_match = re.search(r'(-?\d+\s*°[CF])', resp.text)
-                emoji_match = re.search(r'([\U0001F300-\U0001FAFF\u2600-\u26FF])', resp.text)
-                temp = temp_match.group(1) if temp_match else "N/A"
-                emoji = emoji_match.group(1) if emoji_match else ""
-                return f"{temp} {emoji}"
-            else:
-                return "Weather unavailable"
-        except Exception:
-            return "Weather unavailable"
-
-
+                self.weather.setText("Loading detailed weather...")
+        elif snapshot is not None:
+            self.weather.setText(snapshot.summary_text(stale_after))
+        else:
+            self.weather.setText('Weather unavailable' if self.weather_unavailable else 'Loading weather...')
+
+
+class IslandManager(QObject):
+    # One island per attached display. The island on the primary screen owns the weather service
+    # and scheduler and the others share them, so extra displays add no fetches; each island only
+    # polls the cursor while it is open. Search and command history, bangs and the command
+    # completion index are shared the same way.
+    def __init__(self, parent=None, **island_kwargs):
+        super().__init__(parent)
+        self.geometry = GeometryManager(self)
+        self.island_kwargs = island_kwargs
+        self.primary = DynamicIsland(geometry=self.geometry, **island_kwargs)
+        self.secondary = {}  # QScreen -> DynamicIsland
+        self.geometry.screens_changed.connect(self.sync)
+        self.sync()
+
+    def islands(self):
+        return [self.primary, *self.secondary.values()]
+
+    def sync(self):
+        primary_screen = self.geometry.primary()
+        screens = [screen for screen in self.geometry.screens() if screen is not primary_screen]
+        for screen in [s for s in self.secondary if s not in screens]:
+            self.secondary.pop(screen).dispose()
+        for screen in screens:
+            if screen not in self.secondary:
+                self.secondary[screen] = DynamicIsland(
+                    screen=screen, geometry=self.geometry,
+                    weather_service=self.primary.weather_service,
+                    weather_scheduler=self.primary.weather_scheduler,
+                    bangs=self.primary.bangs, search_history=self.primary.search_history,
+                    command_history=self.primary.command_history, command_index=self.primary.command_index,
+                    **self.island_kwargs)
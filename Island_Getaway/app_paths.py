@@ -0,0 +1,15 @@
+# python
+# Where the Dynamic Island keeps its caches and settings
+# Override the location with the ISLAND_GETAWAY_HOME environment variable
+
+import os
+
+
+def data_dir():
+    path = os.environ.get('ISLAND_GETAWAY_HOME') or os.path.expanduser('~/.island_getaway')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(name):
+    return os.path.join(data_dir(), name)
@@ -0,0 +1,111 @@
+# python
+# Cached rendering of the island's rounded black background
+# Every paint used to build and antialias-fill a fresh QPainterPath, including every frame
+# of the geometry animations. Now:
+#   - sizes the island rests at (painted twice in a row) get a full pixmap in a small LRU;
+#     very large backgrounds are excluded since blending a big translucent pixmap costs
+#     more than filling it
+#   - any other size (animation frames) is drawn as a nine-slice from a cached corner sprite,
+#     which is four blits and three solid fills with no path tessellation
+
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainter, QPainterPath, QPixmap, QColor
+
+DEFAULT_RADIUS = 32
+DEFAULT_CACHE_SIZE = 8
+MAX_CACHED_PIXELS = 250000  # device pixels; above this a full pixmap is slower than nine-slice
+
+
+class BackgroundRenderer:
+    def __init__(self, radius=DEFAULT_RADIUS, color=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.radius = radius
+        self.color = color if color is not None else QColor(0, 0, 0)
+        self.cache_size = cache_size
+        self._pixmaps = OrderedDict()   # (w, h, dpr) -> full background pixmap
+        self._corners = OrderedDict()   # (rx, ry, dpr) -> corner sprite
+        self._last_key = None
+
+    def invalidate(self):
+        self._pixmaps.clear()
+        self._corners.clear()
+        self._last_key = None
+
+    def set_color(self, color):
+        self.color = QColor(color)
+        self.invalidate()
+
+    def paint(self, painter, width, height, dpr=1.0):
+        if width <= 0 or height <= 0:
+            return
+        key = (width, height, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            painter.drawPixmap(0, 0, pixmap)
+        elif key == self._last_key and width * height * dpr * dpr <= MAX_CACHED_PIXELS:
+            # Same size twice in a row: the island has come to rest, cache it whole
+            pixmap = self._render(width, height, dpr)
+            self._remember(self._pixmaps, key, pixmap)
+            painter.drawPixmap(0, 0, pixmap)
+        else:
+            self._paint_nine_slice(painter, width, height, dpr)
+        self._last_key = key
+
+    def _corner_radii(self, width, height):
+        # Same clamping QPainterPath.addRoundedRect applies to absolute radii
+        return min(self.radius, width // 2), min(self.radius, height // 2)
+
+    def _render(self, width, height, dpr):
+        pixmap = QPixmap(int(width * dpr), int(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(0, 0, width, height, self.radius, self.radius)
+        painter.fillPath(path, self.color)
+        painter.end()
+        return pixmap
+
+    def _corner_sprite(self, rx, ry, dpr):
+        key = (rx, ry, dpr)
+        sprite = self._corners.get(key)
+        if sprite is None:
+            sprite = self._render_corner(rx, ry, dpr)
+            self._remember(self._corners, key, sprite)
+        else:
+            self._corners.move_to_end(key)
+        return sprite
+
+    def _render_corner(self, rx, ry, dpr):
+        sprite = QPixmap(int(2 * rx * dpr), int(2 * ry * dpr))
+        sprite.fill(Qt.transparent)
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(dpr, dpr)
+        path = QPainterPath()
+        path.addRoundedRect(0, 0, 2 * rx, 2 * ry, rx, ry)
+        painter.fillPath(path, self.color)
+        painter.end()
+        return sprite
+
+    def _paint_nine_slice(self, painter, width, height, dpr):
+        rx, ry = self._corner_radii(width, height)
+        if rx <= 0 or ry <= 0:
+            painter.fillRect(0, 0, width, height, self.color)
+            return
+        sprite = self._corner_sprite(rx, ry, dpr)
+        sw, sh = rx * dpr, ry * dpr
+        for x, y, sx, sy in ((0, 0, 0, 0), (width - rx, 0, sw, 0),
+                             (0, height - ry, 0, sh), (width - rx, height - ry, sw, sh)):
+            painter.drawPixmap(QRectF(x, y, rx, ry), sprite, QRectF(sx, sy, sw, sh))
+        painter.fillRect(rx, 0, width - 2 * rx, height, self.color)
+        painter.fillRect(0, ry, rx, height - 2 * ry, self.color)
+        painter.fillRect(width - rx, ry, rx, height - 2 * ry, self.color)
+
+    def _remember(self, cache, key, pixmap):
+        cache[key] = pixmap
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
@@ -0,0 +1,92 @@
+# python
+# Local !bang resolution for the search bubble
+# "!g foo" (or "foo !g") becomes the destination URL locally instead of a round trip through the
+# remote bang engine. Bangs come from the bundled bangs.json, overridden and extended by the
+# user's own bangs.json in the data directory; both use DuckDuckGo's {{{s}}} placeholder.
+# Only unknown bangs, and plain queries unless ISLAND_DEFAULT_BANG is set, go to the remote engine.
+
+import os
+import json
+import threading
+from urllib.parse import quote_plus, urlsplit
+from app_paths import data_path
+
+BUNDLED_BANGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bangs.json')
+USER_BANGS_FILE = 'bangs.json'
+REMOTE_ENGINE_URL = 'https://bangathome.free.nf/?q={}'
+DEFAULT_BANG_ENV = 'ISLAND_DEFAULT_BANG'
+PLACEHOLDER = '{{{s}}}'
+
+
+def split_bang(query):
+    # Returns (trigger, terms); the trigger is '' when the query has no bang.
+    # DuckDuckGo accepts the bang as the first or the last word.
+    words = query.split()
+    if not words:
+        return '', ''
+    if words[0].startswith('!') and len(words[0]) > 1:
+        return words[0][1:].lower(), ' '.join(words[1:])
+    if words[-1].startswith('!') and len(words[-1]) > 1:
+        return words[-1][1:].lower(), ' '.join(words[:-1])
+    return '', query.strip()
+
+
+def expand(template, terms):
+    if not terms:
+        # A bare "!gh" opens the site itself
+        parts = urlsplit(template)
+        return f"{parts.scheme}://{parts.netloc}/"
+    return template.replace(PLACEHOLDER, quote_plus(terms))
+
+
+def load_bang_file(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Could not read bangs from {path}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(k).lower().lstrip('!'): v for k, v in data.items() if isinstance(v, str) and PLACEHOLDER in v}
+
+
+class BangResolver:
+    def __init__(self, bundled_path=BUNDLED_BANGS_FILE, user_path=None, default_bang=None):
+        self.bundled_path = bundled_path
+        self.user_path = user_path or data_path(USER_BANGS_FILE)
+        self.default_bang = (default_bang if default_bang is not None
+                             else os.environ.get(DEFAULT_BANG_ENV, '')).lower().lstrip('!')
+        self._templates = None   # trigger -> URL template, built on first use
+        self._lock = threading.Lock()
+
+    def load(self):
+        # Builds the index; safe to call from a background thread to warm it up
+        with self._lock:
+            if self._templates is None:
+                templates = load_bang_file(self.bundled_path)
+                templates.update(load_bang_file(self.user_path))
+                self._templates = templates
+        return self
+
+    def reload(self):
+        with self._lock:
+            self._templates = None
+        return self.load()
+
+    def template(self, trigger):
+        if self._templates is None:
+            self.load()
+        return self._templates.get(trigger.lower().lstrip('!'))
+
+    def resolve(self, query):
+        # Destination URL for a query, or None when it needs the remote engine
+        trigger, terms = split_bang(query)
+        template = self.template(trigger or self.default_bang) if (trigger or self.default_bang) else None
+        if template is None:
+            return None
+        return expand(template, terms)
+
+    def url_for(self, query):
+        return self.resolve(query) or REMOTE_ENGINE_URL.format(quote_plus(query.strip()))
@@ -0,0 +1,604 @@
+# python
+# Headless benchmarks for DynamicIsland hot paths
+# Runs under QT_QPA_PLATFORM=offscreen against mock_weather_server, so no display
+# or network is needed:
+#
+#   python bench.py                  # run everything
+#   python bench.py --only paint     # benchmarks whose name contains "paint"
+#   python bench.py --json out.json  # also write the results as JSON
+#   python bench.py --fuzz 20000     # check the weather parsers against the corpus and mutations of it
+#   python bench.py --check          # check the behaviour of the hooks the benchmarks don't reach
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from mock_weather_server import start_server, SAMPLE_J1, SAMPLE_FORMAT3, SAMPLE_OPEN_METEO
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('ISLAND_GETAWAY_HOME', tempfile.mkdtemp(prefix='island-bench-'))
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_data', 'wttr_corpus.json')
+
+
+def load_corpus(path=CORPUS_FILE):
+    # Recorded and hand-made wttr.in responses with the result each should parse to
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_corpus(corpus):
+    from weather_parser import parse_format3, parse_j1, parse_open_meteo
+    failures = []
+    for text, expected in corpus['format3']:
+        line = parse_format3(text)
+        if (list(line) if line else None) != expected:
+            failures.append(f"format3 {text!r}: got {line}, expected {expected}")
+    for text, expected in corpus['j1']:
+        snapshot = parse_j1(text)
+        got = snapshot and [snapshot.location, snapshot.temp_c, snapshot.temp_f,
+                            snapshot.use_fahrenheit, snapshot.description]
+        if got != expected:
+            failures.append(f"j1 {text[:60]!r}: got {got}, expected {expected}")
+    return failures
+
+
+def fuzz_parsers(corpus, rounds, seed=0):
+    # Mutates corpus entries; the parsers must never raise and the format=3 fast path
+    # must agree with the regex path on every line it accepts
+    from weather_parser import parse_format3, parse_j1, _parse_format3_slow
+    rng = random.Random(seed)
+    alphabet = ' :+-0123456789°CF⛅️☀🌧❄\n_x{}[]",'
+    samples = [text for text, _ in corpus['format3']] + [text for text, _ in corpus['j1']]
+    failures = []
+    for _ in range(rounds):
+        text = list(rng.choice(samples))
+        for _ in range(rng.randint(1, 4)):
+            pos = rng.randint(0, len(text))
+            op = rng.random()
+            if op < 0.4:
+                text.insert(pos, rng.choice(alphabet))
+            elif op < 0.7 and pos < len(text):
+                del text[pos]
+            elif pos < len(text):
+                text[pos] = rng.choice(alphabet)
+        text = ''.join(text)
+        try:
+            fast = parse_format3(text)
+            parse_j1(text)
+        except Exception as e:
+            failures.append(f"{text!r}: {type(e).__name__}: {e}")
+            continue
+        slow = _parse_format3_slow(text.strip())
+        if fast is not None and slow is not None and fast[1:] != slow[1:]:
+            failures.append(f"{text!r}: fast path {fast} != regex path {slow}")
+        elif (fast is None) != (slow is None):
+            failures.append(f"{text!r}: fast path {fast} != regex path {slow}")
+    return failures
+
+
+CHECKS = []
+
+
+def check(fn):
+    # Registers a --check function; each returns a list of failure messages
+    CHECKS.append(fn)
+    return fn
+
+
+def expect(failures, what, got, expected):
+    if got != expected:
+        failures.append(f"{what}: got {got!r}, expected {expected!r}")
+
+
+def wait_ms(ms):
+    # Runs the event loop for ms, so timers and queued signals fire
+    from PyQt5.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec_()
+
+
+@check
+def check_launcher():
+    from launcher import AppLauncher, RecordingBackend
+    failures = []
+    now = [0.0]
+    backend = RecordingBackend()
+    launcher = AppLauncher(backend=backend, debounce_ms=20, cooldown_ms=1000, clock=lambda: now[0])
+    launcher.request('Safari')
+    launcher.request('Safari')
+    expect(failures, 'pending after hover', launcher.is_pending('Safari'), True)
+    launcher.cancel('Safari')
+    wait_ms(50)
+    expect(failures, 'launches after a cancelled hover', backend.launched, [])
+    launcher.request('Safari')
+    launcher.request('Safari')
+    wait_ms(50)
+    expect(failures, 'launches after repeated hovers', backend.launched, ['Safari'])
+    launcher.request('Safari')
+    expect(failures, 'pending inside the cooldown', launcher.is_pending('Safari'), False)
+    launcher.launch_now('Safari')
+    expect(failures, 'launches after a click inside the cooldown', backend.launched, ['Safari'])
+    now[0] = 1.0
+    launcher.launch_now('Safari')
+    expect(failures, 'launches after a click past the cooldown', backend.launched, ['Safari', 'Safari'])
+    return failures
+
+
+@check
+def check_watchdog():
+    from watchdog import StallWatchdog
+    failures = []
+    watchdog = StallWatchdog(threshold_ms=50)
+    watchdog.start()
+
+    def blocking_call():
+        time.sleep(0.3)
+
+    try:
+        wait_ms(150)
+        expect(failures, 'stalls while idle', watchdog.stall_count(), 0)
+        blocking_call()
+        wait_ms(150)
+    finally:
+        watchdog.stop()
+    expect(failures, 'stalls after blocking the loop', watchdog.stall_count(), 1)
+    if watchdog.stalls:
+        stall = watchdog.stalls[0]
+        expect(failures, 'blocking call in the captured stack', 'blocking_call' in stall.stack, True)
+        expect(failures, 'stall recovered', stall.duration_ms is not None and stall.duration_ms >= 250, True)
+    return failures
+
+
+@check
+def check_circuit_breaker():
+    from weather_providers import CircuitBreaker, retry_after_seconds, OPEN_SECONDS
+    failures = []
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=60, max_open_seconds=100, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.record_failure()
+    expect(failures, 'state below the threshold', (breaker.state, breaker.allow()), ('closed', True))
+    breaker.record_failure()
+    expect(failures, 'state at the threshold', (breaker.state, breaker.allow(), breaker.retry_in()), ('open', False, 60))
+    now[0] = 59.0
+    expect(failures, 'allowed before the cool-down ends', breaker.allow(), False)
+    now[0] = 60.0
+    expect(failures, 'trial requests after the cool-down', [breaker.allow(), breaker.allow()], [True, False])
+    breaker.record_failure()
+    expect(failures, 'cool-down after a failed trial', breaker.retry_in(), 100)   # doubled, capped
+    now[0] = 160.0
+    breaker.allow()
+    breaker.record_success()
+    expect(failures, 'state after a good trial', (breaker.state, breaker.failures, breaker.retry_in()), ('closed', 0, 0.0))
+    breaker.record_failure(retry_after=200)
+    expect(failures, 'open for Retry-After', (breaker.state, breaker.retry_in()), ('open', 200))
+    expect(failures, 'Retry-After seconds', retry_after_seconds('120'), 120.0)
+    expect(failures, 'Retry-After date in the past', retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+    expect(failures, 'Retry-After unparseable', retry_after_seconds('soon'), OPEN_SECONDS)
+    return failures
+
+
+@check
+def check_refresh_scheduler():
+    from weather_scheduler import RefreshScheduler
+    failures = []
+    now = [0.0]
+    refreshes = []
+    scheduler = RefreshScheduler(fresh_for=300, visible_interval=300, hidden_interval=1800,
+                                 max_hidden_interval=5000, retry_base=30, max_retry=900,
+                                 clock=lambda: now[0], rng=lambda: 1.0)
+    scheduler.refresh.connect(lambda: refreshes.append(now[0]))
+    scheduler.island_shown('island')
+    expect(failures, 'refreshes on first reveal', refreshes, [0.0])
+    scheduler.record_result(True)
+    expect(failures, 'next refresh while open', scheduler.next_refresh_in(), 300)
+    scheduler.island_hidden('island')
+    expect(failures, 'next refresh once hidden', scheduler.next_refresh_in(), 1800)
+    for expected in (3600, 5000):   # doubles while hidden, up to the cap
+        now[0] += scheduler.next_refresh_in()
+        scheduler._on_timer()
+        scheduler.record_result(True)
+        expect(failures, f'next refresh after {len(refreshes) - 1} hidden refreshes', scheduler.next_refresh_in(), expected)
+    scheduler.refresh_now()
+    scheduler.record_result(False)
+    scheduler.refresh_now()
+    scheduler.record_result(False, retry_after=100)
+    expect(failures, 'retry after two failures', (scheduler.failures, scheduler.next_refresh_in()), (2, 100))
+    now[0] += 400
+    scheduler.refresh_now()
+    scheduler.record_result(False)
+    expect(failures, 'backing off after three failures', (scheduler.backing_off(), scheduler.next_refresh_in()), (True, 120))
+    count = len(refreshes)
+    scheduler.island_shown('island')
+    expect(failures, 'refreshes on reveal while backing off', len(refreshes), count)
+    now[0] += 120
+    scheduler._on_timer()
+    scheduler.record_result(True)
+    expect(failures, 'state after recovering', (scheduler.failures, scheduler.next_refresh_in()), (0, 300))
+    scheduler.island_hidden('island')
+    return failures
+
+
+@check
+def check_scrollback():
+    from scrollback import ScrollbackModel, MAX_LINE_LENGTH
+    failures = []
+    model = ScrollbackModel(max_lines=5, max_bytes=1000)
+    rows = [0]   # row count as seen through the model's signals
+    model.rowsInserted.connect(lambda parent, first, last: rows.__setitem__(0, rows[0] + last - first + 1))
+    model.rowsRemoved.connect(lambda parent, first, last: rows.__setitem__(0, rows[0] - (last - first + 1)))
+    model.append('a\nb')
+    model.append('c\n')
+    expect(failures, 'partial lines joined', model.text(), 'a\nbc')
+    model.append(''.join(f'{i}\n' for i in range(1, 7)))
+    expect(failures, 'oldest lines evicted', model.text(), '2\n3\n4\n5\n6')
+    expect(failures, 'rows seen through signals', rows[0], model.rowCount())
+    expect(failures, 'bytes after evicting', model.total_bytes(), 10)
+    model = ScrollbackModel(max_lines=100, max_bytes=20)
+    for _ in range(3):
+        model.append('x' * 9 + '\n')
+    expect(failures, 'rows kept under the byte cap', (model.rowCount(), model.total_bytes()), (2, 20))
+    model.append('y' * (2 * MAX_LINE_LENGTH + 5) + '\n')
+    expect(failures, 'rows after a line over the byte cap', (model.rowCount(), model.total_bytes()), (2, 16))
+    model = ScrollbackModel()
+    model.append('y' * (2 * MAX_LINE_LENGTH + 5) + '\n')
+    expect(failures, 'rows for a long line', model.rowCount(), 3)
+    return failures
+
+
+@check
+def check_search_history():
+    from search_history import SearchHistory, HALF_LIFE
+    failures = []
+    path = os.path.join(tempfile.mkdtemp(), 'history.jsonl')
+    now = [1.7e9]
+    history = SearchHistory(path=path, max_entries=10, clock=lambda: now[0])
+    for query in ('python docs', 'python docs', 'python docs', 'python tutorial', 'rust book'):
+        history.record(query)
+    expect(failures, 'suggestions by use count', history.suggest('py'), ['python docs', 'python tutorial'])
+    expect(failures, 'suggestions outside any prefix', (history.suggest('pz'), history.suggest(' ')), ([], []))
+    now[0] += 4 * HALF_LIFE
+    history.record('Python  Tutorial')
+    expect(failures, 'suggestions after a recent use', history.suggest('PY'), ['Python Tutorial', 'python docs'])
+    expect(failures, 'entries after a differently cased use', len(history), 3)
+    reloaded = SearchHistory(path=path, max_entries=10, clock=lambda: now[0])
+    expect(failures, 'suggestions after reloading', reloaded.suggest('py'), history.suggest('py'))
+    for i in range(8):
+        history.record(f'query {i}')
+    expect(failures, 'entries after filling up', len(history), 9)
+    expect(failures, 'best entry kept on eviction', history.suggest('python')[:1], ['Python Tutorial'])
+    return failures
+
+
+@check
+def check_command_history():
+    from command_history import CommandHistory, HistoryNavigator
+    failures = []
+    path = os.path.join(tempfile.mkdtemp(), 'commands.jsonl')
+    history = CommandHistory(path=path)
+    for command in ('ls', 'git status', 'git log', ' ls ', ''):
+        history.add(command)
+    expect(failures, 'commands kept', list(history), ['git status', 'git log', 'ls'])
+    expect(failures, 'commands after reloading', list(CommandHistory(path=path).load()), list(history))
+    expect(failures, 'reverse search', (history.search('git'), history.search('git', before=1), history.search('hg')),
+           (1, 0, None))
+    navigator = HistoryNavigator(history)
+    walk = [navigator.older('') for _ in range(4)] + [navigator.newer() for _ in range(3)]
+    expect(failures, 'Up and Down', walk, ['ls', 'git log', 'git status', None, 'git log', 'ls', ''])
+    navigator.reset()
+    walk = [navigator.older('git'), navigator.older('git'), navigator.newer(), navigator.newer(), navigator.newer()]
+    expect(failures, 'Up and Down with a prefix', walk, ['git log', 'git status', 'git log', 'git', None])
+    return failures
+
+
+@check
+def check_background_load():
+    import threading
+    from history_log import BackgroundLoad
+    from search_history import SearchHistory
+    failures = []
+    path = os.path.join(tempfile.mkdtemp(), 'history.jsonl')
+    SearchHistory(path=path).record('python docs')
+    history = SearchHistory(path=path)
+    release = threading.Event()
+
+    def held_load():   # a replay that takes until release is set
+        release.wait(5)
+        history.load()
+
+    history._loader = BackgroundLoad(held_load, 'check-history')
+    history.load_in_background()
+    history.record('python tutorial')
+    expect(failures, 'suggestions while loading', (history.loading(), history.suggest('py')), (True, []))
+    release.set()
+    history._loader._thread.join(5)
+    expect(failures, 'suggestions after loading', sorted(history.suggest('py')), ['python docs', 'python tutorial'])
+    expect(failures, 'use made while loading is logged', sorted(SearchHistory(path=path).suggest('py')),
+           ['python docs', 'python tutorial'])
+    return failures
+
+
+def run_checks():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    failures = []
+    for fn in CHECKS:
+        try:
+            failures += [f"{fn.__name__}: {failure}" for failure in fn()]
+        except Exception as e:
+            failures.append(f"{fn.__name__}: {type(e).__name__}: {e}")
+    return failures
+
+
+def measure(fn, iterations, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'mean_ms': sum(samples) / len(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max_ms': samples[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DynamicIsland hot paths headlessly")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every iteration count")
+    parser.add_argument('--only', default='', help="run only benchmarks whose name contains this")
+    parser.add_argument('--json', metavar='PATH', help="write results to PATH")
+    parser.add_argument('--fuzz', type=int, metavar='ROUNDS',
+                        help="check the weather parsers against the corpus and ROUNDS mutations, then exit")
+    parser.add_argument('--check', action='store_true',
+                        help="check the behaviour of launcher, scheduler, history and similar hooks, then exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failures = run_checks()
+        for failure in failures:
+            print(failure)
+        print(f"{len(CHECKS)} checks: {len(failures)} failures")
+        return not failures
+
+    corpus = load_corpus()
+    if args.fuzz is not None:
+        failures = check_corpus(corpus) + fuzz_parsers(corpus, args.fuzz)
+        for failure in failures[:20]:
+            print(failure)
+        print(f"{len(corpus['format3']) + len(corpus['j1'])} corpus entries, {args.fuzz} mutations: "
+              f"{len(failures)} failures")
+        return not failures
+
+    server = start_server()
+    os.environ['ISLAND_WTTR_URL'] = f'http://127.0.0.1:{server.server_port}'
+    os.environ['ISLAND_OPEN_METEO_URL'] = f'http://127.0.0.1:{server.server_port}'
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    import weather_service
+    import weather_providers
+    from IslandGetaway import DynamicIsland
+    from island_modes import COLLAPSED, STANDARD
+    from weather_model import WeatherSnapshot
+    from weather_parser import parse_format3, parse_j1, parse_open_meteo
+
+    def n(count):
+        return max(1, int(count * args.scale))
+
+    benchmarks = []
+
+    def benchmark(name, iterations):
+        def register(fn):
+            benchmarks.append((name, fn, iterations))
+            return fn
+        return register
+
+    def dispose(island):
+        island.dispose()
+        app.processEvents()
+
+    @benchmark('construct DynamicIsland', n(20))
+    def _():
+        dispose(DynamicIsland(lazy_weather=True))
+
+    island = DynamicIsland(lazy_weather=True)
+    island.show()
+    app.processEvents()
+
+    @benchmark('check_mouse tick', n(5000))
+    def _():
+        island.check_mouse()
+
+    geometries = {
+        'notch': island.rects.notch,
+        'island': island.rects.island,
+        'detailed weather': island.rects.detailed,
+        'terminal': island.rects.terminal,
+    }
+    for geo_name, rect in geometries.items():
+        @benchmark(f'paint at {geo_name} ({rect.width()}x{rect.height()})', n(300))
+        def _(rect=rect):
+            if island.geometry() != rect:
+                island.setGeometry(rect)
+            island.repaint()
+
+    frames = 21  # one 350 ms animation at 60 fps
+
+    @benchmark('animation frame (show)', n(30))
+    def _():
+        anim = island.modes.anim
+        anim.stop()
+        anim.setStartValue(geometries['notch'])
+        anim.setEndValue(geometries['island'])
+        for i in range(frames):
+            anim.setCurrentTime(int(anim.duration() * i / (frames - 1)))
+            island.repaint()
+
+    @benchmark('mode change mid-animation (hover out and back in)', n(2000))
+    def _():
+        island.modes.set_mode(COLLAPSED)
+        island.modes.set_mode(STANDARD)
+
+    @benchmark('weather parse (j1 -> snapshot)', n(5000))
+    def _():
+        WeatherSnapshot.from_j1(SAMPLE_J1)
+
+    sample_j1_text = json.dumps(SAMPLE_J1)
+    format3_lines = [text for text, _ in corpus['format3']]
+
+    @benchmark('weather parse (j1 text -> snapshot)', n(5000))
+    def _():
+        parse_j1(sample_j1_text)
+
+    @benchmark('weather parse (format=3 line)', n(20000))
+    def _():
+        parse_format3(SAMPLE_FORMAT3)
+
+    @benchmark(f'weather parse (format=3 corpus, {len(format3_lines)} lines)', n(2000))
+    def _():
+        for line in format3_lines:
+            parse_format3(line)
+
+    providers = weather_providers.ProviderChain([weather_providers.WttrProvider(),
+                                                 weather_providers.OpenMeteoProvider()])
+
+    @benchmark('weather fetch (local server)', n(100))
+    def _():
+        weather_service.fetch_weather_snapshot(providers=providers)
+
+    sample_open_meteo_text = json.dumps(SAMPLE_OPEN_METEO)
+
+    @benchmark('weather parse (Open-Meteo text -> snapshot)', n(5000))
+    def _():
+        parse_open_meteo(sample_open_meteo_text, 'Pittsburgh')
+
+    # Failover: the preferred provider answers 503 slowly until its circuit opens
+    failing = start_server(delay_ms=50, failing=['wttr'])
+    failover = weather_providers.ProviderChain([
+        weather_providers.WttrProvider(f'http://127.0.0.1:{failing.server_port}'),
+        weather_providers.OpenMeteoProvider()])
+
+    @benchmark('weather fetch (failover, primary down)', n(50))
+    def _():
+        weather_service.fetch_weather_snapshot(providers=failover)
+
+    from bangs import BangResolver
+    bangs = BangResolver().load()
+
+    @benchmark('bang resolve (!g query)', n(20000))
+    def _():
+        bangs.url_for('!g dynamic island notch')
+
+    @benchmark('bang index load', n(200))
+    def _():
+        BangResolver().load()
+
+    from search_history import SearchHistory, DEFAULT_MAX_ENTRIES
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    history = SearchHistory(path=os.path.join(tempfile.mkdtemp(), 'history.jsonl'))
+    fake_now = [1.7e9]
+    history.clock = lambda: fake_now[0]
+    for _ in range(DEFAULT_MAX_ENTRIES):
+        history.record(' '.join(rng.choice(words) for _ in range(rng.randint(1, 4))))
+        fake_now[0] += rng.random() * 600
+
+    @benchmark(f'search suggest (1 char, {len(history)} entries)', n(2000))
+    def _():
+        history.suggest('p')
+
+    @benchmark(f'search suggest (3 chars, {len(history)} entries)', n(2000))
+    def _():
+        history.suggest('pre')
+
+    @benchmark(f'search history load ({len(history)} entries)', n(5))
+    def _():
+        SearchHistory(path=history.path).load()
+
+    from command_completion import CompletionIndex
+    from command_history import CommandHistory
+    completion = CompletionIndex()
+    completion.refresh()
+
+    @benchmark('command index build ($PATH)', n(5))
+    def _():
+        CompletionIndex().refresh()
+
+    @benchmark('command index refresh ($PATH unchanged)', n(200))
+    def _():
+        completion.refresh()
+
+    @benchmark(f'tab completion (command, {len(completion.commands(""))} on $PATH)', n(5000))
+    def _():
+        completion.complete('gi')
+
+    @benchmark('tab completion (path)', n(5000))
+    def _():
+        completion.complete('cat ./b')
+
+    commands = CommandHistory(path=os.path.join(tempfile.mkdtemp(), 'commands.jsonl'))
+    for _ in range(commands.max_entries):
+        commands.add(' '.join(rng.choice(words) for _ in range(rng.randint(1, 5))))
+
+    @benchmark(f'command history reverse search ({len(commands)} commands, no match)', n(200))
+    def _():
+        commands.search('zzzz')
+
+    @benchmark('first terminal build', n(10))
+    def _():
+        fresh = DynamicIsland(lazy_weather=True)
+        fresh.ensure_terminal()
+        dispose(fresh)
+
+    island.ensure_terminal().show()
+    chunk = ''.join(f"{i:08d} some typical command output line with a few words in it\n" for i in range(64))
+
+    @benchmark('terminal output 1 MB (append + paint)', n(5))
+    def _():
+        island.terminal_scrollback.clear()
+        written = 0
+        while written < 1024 * 1024:
+            island.append_terminal_output(chunk)
+            written += len(chunk)
+        island.terminal_output.viewport().repaint()
+
+    results = {}
+    for name, fn, iterations in benchmarks:
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(fn, iterations)
+        r = results[name]
+        print(f"{name:<44} mean {r['mean_ms']:9.3f} ms  p50 {r['p50_ms']:9.3f}  "
+              f"p95 {r['p95_ms']:9.3f}  max {r['max_ms']:9.3f}  (n={iterations})")
+        if name.startswith('animation frame'):
+            print(f"{'':<44} = {r['mean_ms'] / frames:.3f} ms per frame")
+
+    from http_client import metrics_report
+    for host, r in metrics_report().items():
+        if r['count']:
+            print(f"{'http ' + str(host):<44} mean {r['mean_ms']:9.3f} ms  p50 {r['p50_ms']:9.3f}  "
+                  f"p95 {r['p95_ms']:9.3f}  max {r['max_ms']:9.3f}  (n={r['count']}, "
+                  f"{r['not_modified']} not modified)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    server.shutdown()
+    failing.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    result = main()
+    sys.exit(0 if result is not False else 1)
@@ -0,0 +1,154 @@
+# python
+# Tab completion for the terminal island: executables on $PATH and file paths
+# Directory listings are cached with the directory's mtime, so a refresh only re-reads the
+# directories that changed. The executables of every $PATH directory are merged into one sorted
+# list that completion bisects. It is built on a background thread when the terminal first opens
+# and refreshed the same way each time it opens again, so Tab never waits on $PATH.
+
+import os
+import bisect
+import threading
+
+MAX_CACHED_DIRS = 64     # file-path listings kept; $PATH directories are kept separately
+
+
+def common_prefix(words):
+    return os.path.commonprefix(list(words))
+
+
+def _mtime(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _prefix_range(names, prefix):
+    start = bisect.bisect_left(names, prefix)
+    end = bisect.bisect_left(names, prefix + '\uffff', start)
+    return names[start:end]
+
+
+class CompletionIndex:
+    def __init__(self, path_env=None, cwd=None):
+        self.path_env = path_env        # None reads $PATH on every refresh
+        self.cwd = cwd                  # None completes relative paths from the current directory
+        self._executables = []          # sorted names from every $PATH directory
+        self._path_dirs = ()
+        self._path_listings = {}        # $PATH directory -> (mtime, executable names)
+        self._listings = {}             # directory -> (mtime, sorted names, directory names)
+        self._lock = threading.Lock()
+        self._listings_lock = threading.Lock()
+        self._thread = None
+
+    def refresh(self):
+        # Re-reads only the $PATH directories that changed; returns True if the index changed
+        with self._lock:
+            path_env = self.path_env if self.path_env is not None else os.environ.get('PATH', '')
+            dirs = tuple(dict.fromkeys(d for d in path_env.split(os.pathsep) if d))
+            changed = dirs != self._path_dirs
+            for directory in dirs:
+                changed |= self._scan_executables(directory)
+            for directory in [d for d in self._path_listings if d not in dirs]:
+                del self._path_listings[directory]
+            if changed:
+                names = set()
+                for directory in dirs:
+                    names.update(self._path_listings[directory][1])
+                self._executables = sorted(names)
+                self._path_dirs = dirs
+        # Warm the current directory too, the usual target of a file-path Tab
+        self._listing(self.cwd or os.getcwd())
+        return changed
+
+    def refresh_in_background(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.refresh, name='island-completion', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _scan_executables(self, directory):
+        mtime = _mtime(directory)
+        cached = self._path_listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return False
+        names = set()
+        if mtime is not None:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file() and os.access(entry.path, os.X_OK):
+                                names.add(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+        self._path_listings[directory] = (mtime, frozenset(names))
+        return True
+
+    def commands(self, prefix, limit=None):
+        # Executables on $PATH starting with prefix; empty until the first refresh finishes
+        return _prefix_range(self._executables, prefix)[:limit]
+
+    def paths(self, prefix, limit=None):
+        # "~/Doc" -> ["~/Documents/"]; directories end with a slash, the rest is kept as typed
+        if prefix == '~':
+            return ['~/']
+        head, tail = prefix[:prefix.rfind('/') + 1], prefix[prefix.rfind('/') + 1:]
+        directory = os.path.expanduser(head) if head else '.'
+        if not os.path.isabs(directory):
+            directory = os.path.join(self.cwd or os.getcwd(), directory)
+        listing = self._listing(directory)
+        if listing is None:
+            return []
+        _, names, dirs = listing
+        matches = []
+        for name in _prefix_range(names, tail):
+            if name.startswith('.') and not tail.startswith('.'):
+                continue  # hidden files only when asked for
+            matches.append(head + name + ('/' if name in dirs else ''))
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def _listing(self, directory):
+        directory = os.path.normpath(directory)
+        mtime = _mtime(directory)
+        if mtime is None:
+            return None
+        with self._listings_lock:
+            cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        names, dirs = [], set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    names.append(entry.name)
+                    try:
+                        if entry.is_dir():
+                            dirs.add(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            return None
+        names.sort()
+        listing = (mtime, names, frozenset(dirs))
+        with self._listings_lock:
+            if len(self._listings) >= MAX_CACHED_DIRS:
+                self._listings.pop(next(iter(self._listings)))
+            self._listings[directory] = listing
+        return listing
+
+    def complete(self, line, cursor=None, limit=None):
+        # Candidates for the word before the cursor: a command name in the first word, unless
+        # it looks like a path, and a file path anywhere else. Returns (word start, candidates).
+        cursor = len(line) if cursor is None else cursor
+        before = line[:cursor]
+        start = max(before.rfind(' '), before.rfind('\t')) + 1
+        word = before[start:]
+        first_word = not before[:start].strip() or before[:start].rstrip().endswith(('|', ';', '&&'))
+        if first_word and '/' not in word and not word.startswith('~'):
+            return start, self.commands(word, limit)
+        return start, self.paths(word, limit)
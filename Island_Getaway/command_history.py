@@ -0,0 +1,126 @@
+# python
+# Persistent command history for the terminal island
+# Commands are kept oldest first, each only once at its latest use, so Up walks back through
+# distinct commands. On disk the history is a HistoryLog with one command per line, appended on
+# every run and compacted to the commands kept.
+
+import threading
+from app_paths import data_path
+from history_log import HistoryLog, BackgroundLoad
+
+HISTORY_FILE = 'command_history.jsonl'
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class CommandHistory:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or data_path(HISTORY_FILE)
+        self.log = HistoryLog(self.path, 'Command history')
+        self.max_entries = max_entries
+        self._commands = []     # oldest first, no duplicates
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._loader = BackgroundLoad(self.load, 'island-command-history')
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __getitem__(self, index):
+        return self._commands[index]
+
+    def load_in_background(self):
+        self._loader.start()
+
+    def loading(self):
+        return self._loader.pending()
+
+    def load(self):
+        # Replays the log, blocking until done
+        with self._lock:
+            if self._loaded:
+                return self
+            commands = [command for command in self.log.replay() if isinstance(command, str)]
+            # Keep each command at its last use only
+            seen = set()
+            kept = []
+            for command in reversed(commands):
+                if command not in seen:
+                    seen.add(command)
+                    kept.append(command)
+            kept.reverse()
+            self._commands = kept[-self.max_entries:]
+            self._loaded = True
+            self._loader.finish()
+        return self
+
+    def add(self, command):
+        command = command.strip()
+        if not command:
+            return
+        if self._loader.defer(self._add, command):
+            return
+        self.load()
+        with self._lock:
+            self._add(command)
+
+    def _add(self, command):
+        if self._commands and self._commands[-1] == command:
+            return
+        try:
+            self._commands.remove(command)
+        except ValueError:
+            pass
+        self._commands.append(command)
+        if len(self._commands) > self.max_entries:
+            del self._commands[:len(self._commands) - self.max_entries]
+        self.log.append(command, len(self._commands), lambda: self._commands)
+
+    def search(self, text, before=None):
+        # Index of the latest command containing text and older than before (reverse-i-search);
+        # None while loading
+        if self._loader.pending():
+            return None
+        self.load()
+        commands = self._commands
+        start = len(commands) if before is None else min(before, len(commands))
+        for i in range(start - 1, -1, -1):
+            if text in commands[i]:
+                return i
+        return None
+
+
+class HistoryNavigator:
+    # Up/Down through the history. With something typed, only commands starting with it are
+    # visited, and Down past the newest one brings back what was typed.
+    def __init__(self, history):
+        self.history = history
+        self.reset()
+
+    def reset(self):
+        self.position = None    # index into the history while navigating, None while editing
+        self.draft = ''
+
+    def older(self, text):
+        if self.history.loading():
+            return None
+        self.history.load()
+        if self.position is None:
+            self.draft = text
+            start = len(self.history)
+        else:
+            start = self.position
+        for i in range(start - 1, -1, -1):
+            if self.history[i].startswith(self.draft):
+                self.position = i
+                return self.history[i]
+        return None
+
+    def newer(self):
+        if self.position is None:
+            return None
+        for i in range(self.position + 1, len(self.history)):
+            if self.history[i].startswith(self.draft):
+                self.position = i
+                return self.history[i]
+        self.position = None
+        return self.draft
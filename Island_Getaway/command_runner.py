@@ -0,0 +1,146 @@
+# python
+# Asynchronous shell command execution for the terminal island
+# Commands run in QProcess so the event loop keeps running; output is streamed as it arrives.
+# Each shell leads its own session, so cancelling or timing out a command stops its whole
+# process group (every stage of a pipeline), not just the shell: SIGTERM, then SIGKILL.
+
+import os
+import sys
+import codecs
+import signal
+from PyQt5.QtCore import QObject, QProcess, QTimer, pyqtSignal
+
+DEFAULT_TIMEOUT_MS = 30000
+DEFAULT_MAX_CONCURRENT = 4
+KILL_GRACE_MS = 2000      # between SIGTERM and SIGKILL for the process group
+
+# Runs the shell in a new session. os.setsid rather than the setsid tool, which macOS lacks
+# and which forks (so QProcess would lose the shell) when its caller leads a process group.
+NEW_SESSION_EXEC = 'import os, sys; os.setsid(); os.execvp(sys.argv[1], sys.argv[1:])'
+
+
+class _Job:
+    def __init__(self, job_id, cmd, process, timer):
+        self.id = job_id
+        self.cmd = cmd
+        self.process = process
+        self.timer = timer
+        self.pgid = None      # the shell's pid, which leads the command's process group
+        self.status = 'ok'
+        self.decoders = {
+            QProcess.StandardOutput: codecs.getincrementaldecoder('utf-8')(errors='replace'),
+            QProcess.StandardError: codecs.getincrementaldecoder('utf-8')(errors='replace'),
+        }
+
+
+class CommandRunner(QObject):
+    started = pyqtSignal(int, str)           # job id, command
+    output = pyqtSignal(int, str, bool)      # job id, text chunk, is_stderr
+    finished = pyqtSignal(int, int, str)     # job id, exit code, status: ok/timeout/cancelled/error
+
+    def __init__(self, parent=None, timeout_ms=DEFAULT_TIMEOUT_MS, max_concurrent=DEFAULT_MAX_CONCURRENT,
+                 shell=None):
+        super().__init__(parent)
+        self.timeout_ms = timeout_ms
+        self.max_concurrent = max_concurrent
+        self.shell = shell or os.environ.get('SHELL') or '/bin/sh'
+        self.new_session = hasattr(os, 'setsid')
+        self._jobs = {}
+        self._next_id = 1
+
+    def running(self):
+        return list(self._jobs)
+
+    def run(self, cmd, timeout_ms=None):
+        # Returns the job id, or None if too many commands are already running
+        if len(self._jobs) >= self.max_concurrent:
+            return None
+        job_id = self._next_id
+        self._next_id += 1
+
+        process = QProcess(self)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        job = _Job(job_id, cmd, process, timer)
+        self._jobs[job_id] = job
+
+        process.readyReadStandardOutput.connect(lambda: self._read(job, QProcess.StandardOutput))
+        process.readyReadStandardError.connect(lambda: self._read(job, QProcess.StandardError))
+        process.finished.connect(lambda code, _status: self._finish(job, code))
+        process.errorOccurred.connect(lambda error: self._on_error(job, error))
+        if self.new_session:
+            process.started.connect(lambda: setattr(job, 'pgid', int(process.processId())))
+        timer.timeout.connect(lambda: self._stop(job, 'timeout'))
+
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+        if timeout_ms:
+            timer.start(timeout_ms)
+        self.started.emit(job_id, cmd)
+        if self.new_session:
+            process.start(sys.executable, ['-S', '-c', NEW_SESSION_EXEC, self.shell, '-c', cmd])
+        else:
+            process.start(self.shell, ['-c', cmd])
+        return job_id
+
+    def cancel(self, job_id=None):
+        # Cancels one job, or every running job when job_id is None
+        jobs = list(self._jobs.values()) if job_id is None else [self._jobs.get(job_id)]
+        for job in jobs:
+            if job is not None:
+                self._stop(job, 'cancelled')
+
+    def _stop(self, job, status):
+        if job.id not in self._jobs:
+            return
+        job.status = status
+        self._signal(job, signal.SIGTERM)
+        # Whatever ignores SIGTERM, including stages that outlive the shell, is killed after a grace period
+        QTimer.singleShot(KILL_GRACE_MS, lambda: self._signal(job, signal.SIGKILL))
+
+    def _signal(self, job, sig):
+        if job.pgid is not None:
+            try:
+                os.killpg(job.pgid, sig)
+                return
+            except ProcessLookupError:
+                pass  # the group is gone, or the shell has not called setsid yet
+            except PermissionError:
+                return
+        if job.id in self._jobs:
+            if sig == signal.SIGTERM:
+                job.process.terminate()
+            else:
+                job.process.kill()
+
+    def _read(self, job, channel):
+        job.process.setReadChannel(channel)
+        data = bytes(job.process.readAll())
+        text = job.decoders[channel].decode(data)
+        if text:
+            self.output.emit(job.id, text, channel == QProcess.StandardError)
+
+    def _on_error(self, job, error):
+        # FailedToStart never produces finished(), so clean up here
+        if error == QProcess.FailedToStart and job.id in self._jobs:
+            job.status = 'error'
+            self.output.emit(job.id, job.process.errorString() + '\n', True)
+            self._finish(job, -1)
+
+    def _finish(self, job, exit_code):
+        if self._jobs.pop(job.id, None) is None:
+            return
+        job.timer.stop()
+        for channel in (QProcess.StandardOutput, QProcess.StandardError):
+            self._read(job, channel)
+            tail = job.decoders[channel].decode(b'', final=True)
+            if tail:
+                self.output.emit(job.id, tail, channel == QProcess.StandardError)
+        self.finished.emit(job.id, exit_code, job.status)
+        job.process.deleteLater()
+        job.timer.deleteLater()
+
+    def shutdown(self, timeout_ms=1000):
+        # Connected to QApplication.aboutToQuit so no command outlives the island
+        for job in list(self._jobs.values()):
+            self._signal(job, signal.SIGKILL)
+            job.process.waitForFinished(timeout_ms)
@@ -0,0 +1,101 @@
+# python
+# Append-only JSON-lines log, the on-disk format of the search and command histories
+# Each change is appended as one JSON value per line and the owner rebuilds its state by
+# replaying the log from the top; a line torn by a crash mid-write is skipped. Once the log has
+# grown well past the lines the live state needs, it is rewritten from that state through a
+# temp file and a rename, so a crash leaves either the old log or the new one.
+# Replaying a long log takes a while, so histories load on a BackgroundLoad thread and the GUI
+# thread never waits for it: lookups come back empty until it is done, and changes made in the
+# meantime are queued and applied when it finishes.
+
+import os
+import json
+import threading
+
+COMPACT_SLACK = 1000   # lines beyond twice the live entries before the log is rewritten
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+class HistoryLog:
+    # Not locked itself: the owning history serialises calls under its own lock
+    def __init__(self, path, label):
+        self.path = path
+        self.label = label     # names the history in error messages
+        self.lines = 0         # lines in the file on disk, live or not
+
+    def replay(self):
+        # Yields every record that decodes
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a torn last line after a crash
+                    self.lines += 1
+                    yield record
+        except OSError:
+            pass
+
+    def append(self, record, live, snapshot):
+        # live: entries in the owner's state; snapshot() returns their records for a rewrite
+        if self.lines > 2 * live + COMPACT_SLACK:
+            self.compact(snapshot())
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(_dumps(record) + '\n')
+            self.lines += 1
+        except OSError as e:
+            print(f"{self.label} write failed: {e}")
+
+    def compact(self, records):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                lines = 0
+                for record in records:
+                    f.write(_dumps(record) + '\n')
+                    lines += 1
+            os.replace(tmp_path, self.path)
+            self.lines = lines
+        except OSError as e:
+            print(f"{self.label} write failed: {e}")
+
+
+class BackgroundLoad:
+    def __init__(self, load, name):
+        self._load = load      # the history's blocking load(); it calls finish() when done
+        self._name = name
+        self._thread = None
+        self._deferred = []
+        self._lock = threading.Lock()
+        self.done = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name=self._name, daemon=True)
+            self._thread.start()
+
+    def pending(self):
+        # True while the thread is still replaying; a load that died is retried by the next load()
+        return not self.done and self._thread is not None and self._thread.is_alive()
+
+    def defer(self, fn, *args):
+        # Queues fn(*args) for the end of the load; False if nothing is loading and fn should run now
+        with self._lock:
+            if not self.pending():
+                return False
+            self._deferred.append((fn, args))
+            return True
+
+    def finish(self):
+        # Called at the end of load(), under the history's lock, which the deferred calls expect
+        with self._lock:
+            self.done = True
+            deferred, self._deferred = self._deferred, []
+        for fn, args in deferred:
+            fn(*args)
@@ -0,0 +1,75 @@
+# python
+# Event-driven hover detection for the notch
+# While the island is hidden a tiny, invisible trigger window sits over the notch and
+# reports enter events, so nothing polls the cursor. Polling only runs while the island
+# is open, where it is needed to notice the cursor leaving the island or terminal.
+
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtWidgets import QWidget
+
+ISLAND_POLL_INTERVAL = 100  # ms, only while the island is visible
+
+
+class NotchTrigger(QWidget):
+    entered = pyqtSignal()
+
+    def __init__(self, rect):
+        super().__init__(None)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool |
+                            Qt.WindowDoesNotAcceptFocus)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setGeometry(rect)
+
+    def paintEvent(self, event):
+        # Fully transparent windows do not receive mouse events on macOS, so paint
+        # an almost invisible fill
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 1))
+
+    def enterEvent(self, event):
+        self.entered.emit()
+
+    def mousePressEvent(self, event):
+        self.entered.emit()
+
+
+class HoverTracker(QObject):
+    notch_entered = pyqtSignal()
+    poll = pyqtSignal()
+
+    def __init__(self, notch_rect, parent=None):
+        super().__init__(parent)
+        self.trigger = NotchTrigger(notch_rect)
+        self.trigger.entered.connect(self._on_trigger_entered)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(ISLAND_POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def _on_trigger_entered(self):
+        if self.trigger.isVisible():
+            self.notch_entered.emit()
+
+    def watch_notch(self):
+        # Island hidden: no timers, just the trigger window
+        self.poll_timer.stop()
+        self.trigger.show()
+        self.trigger.raise_()
+
+    def watch_island(self):
+        # Island open: trigger out of the way, poll for the cursor leaving
+        self.trigger.hide()
+        self.poll_timer.start()
+
+    def pause(self):
+        self.poll_timer.stop()
+
+    def set_notch_rect(self, rect):
+        self.trigger.setGeometry(rect)
+
+    def close(self):
+        # The trigger is a top-level window with no parent, so nothing else would delete it
+        self.poll_timer.stop()
+        self.trigger.close()
+        self.trigger.deleteLater()
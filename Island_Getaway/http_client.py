@@ -0,0 +1,106 @@
+# python
+# Shared HTTP client for everything in the island that talks to the network
+# One pooled keep-alive session, gzip, ETag/If-Modified-Since revalidation and latency metrics
+
+import time
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'IslandGetaway'
+
+
+class LatencyMetrics:
+    def __init__(self, max_samples=200):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, host, status, elapsed_ms):
+        with self._lock:
+            self._samples.append((time.time(), host, status, elapsed_ms))
+
+    def samples(self, host=None):
+        with self._lock:
+            return [s for s in self._samples if host is None or s[1] == host]
+
+    def summary(self, host=None):
+        times = sorted(s[3] for s in self.samples(host))
+        if not times:
+            return {'count': 0}
+        return {
+            'count': len(times),
+            'mean_ms': sum(times) / len(times),
+            'p50_ms': times[len(times) // 2],
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+            'max_ms': times[-1],
+            'not_modified': sum(1 for s in self.samples(host) if s[2] == 304),
+        }
+
+    def report(self):
+        # summary() for every host seen, for the --profile report and bench.py
+        hosts = sorted({s[1] for s in self.samples()}, key=str)
+        return {host: self.summary(host) for host in hosts}
+
+
+class HttpClient:
+    def __init__(self, pool_size=4, max_samples=200):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        self.metrics = LatencyMetrics(max_samples)
+        # url -> last 200 response that carried a validator (ETag / Last-Modified)
+        self._validated = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=5, conditional=True, **kwargs):
+        headers = dict(kwargs.pop('headers', None) or {})
+        with self._lock:
+            previous = self._validated.get(url) if conditional else None
+        if previous is not None:
+            if previous.headers.get('ETag'):
+                headers['If-None-Match'] = previous.headers['ETag']
+            if previous.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = previous.headers['Last-Modified']
+
+        start = time.perf_counter()
+        resp = self.session.get(url, timeout=timeout, headers=headers, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics.record(urlsplit(url).hostname, resp.status_code, elapsed_ms)
+
+        if resp.status_code == 304 and previous is not None:
+            return previous
+        if conditional and resp.status_code == 200 and (
+                resp.headers.get('ETag') or resp.headers.get('Last-Modified')):
+            with self._lock:
+                self._validated[url] = resp
+        return resp
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def shared_client():
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def metrics_report():
+    # Latency per host of the shared client; empty if nothing has used the network yet
+    with _shared_lock:
+        client = _shared_client
+    return client.metrics.report() if client is not None else {}
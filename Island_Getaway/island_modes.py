@@ -0,0 +1,103 @@
+# python
+# What the island is showing, and the one animation that moves it there
+# The island is always in exactly one mode, and each mode has one shape from the screen's cached
+# layout. Changing mode while a transition is still running retargets it from wherever the island
+# is at that moment, with the duration scaled to the distance left, instead of restarting from
+# the old start shape. Asking for the mode the island is already in does nothing, so rapid hover
+# in and out costs no extra geometry or layout passes.
+
+from PyQt5.QtCore import QObject, QPropertyAnimation, QEasingCurve, pyqtSignal
+
+COLLAPSED = 'collapsed'   # hidden behind the notch
+STANDARD = 'standard'
+DETAILED = 'detailed'     # detailed weather
+TERMINAL = 'terminal'
+SEARCH = 'search'         # the search bubble below the shape of the mode it was opened from
+
+MODE_SHAPES = {
+    COLLAPSED: 'notch',
+    STANDARD: 'island',
+    DETAILED: 'detailed',
+    TERMINAL: 'terminal',
+}
+
+DURATION_MS = 350
+MIN_DURATION_MS = 90      # a retarget close to its goal still eases instead of snapping
+
+
+def distance(a, b):
+    # Largest distance any edge has to travel between two rectangles
+    return max(abs(a.left() - b.left()), abs(a.top() - b.top()),
+               abs(a.right() - b.right()), abs(a.bottom() - b.bottom()))
+
+
+class IslandModes(QObject):
+    changed = pyqtSignal(str, str)   # old, new; emitted before the island starts moving
+    settled = pyqtSignal(str)        # the island has reached the shape of this mode
+
+    def __init__(self, widget, layout, duration=DURATION_MS):
+        super().__init__(widget)
+        self.widget = widget
+        self.layout = layout         # callable returning the current IslandLayout
+        self.duration = duration
+        self.mode = COLLAPSED
+        self.search_from = STANDARD   # the mode search was entered from, and returns to
+        self.anim = QPropertyAnimation(widget, b"geometry", self)
+        self.anim.setDuration(duration)
+        self.anim.setEasingCurve(QEasingCurve.OutCubic)
+        self.anim.setEndValue(self.rect_for(self.mode))   # the shape the island rests at
+        # Connected once; the mode says what finishing means
+        self.anim.finished.connect(self._on_finished)
+
+    def underlying(self, mode=None):
+        # The mode whose shape and contents mode shows: search keeps those of the mode it came from
+        mode = mode or self.mode
+        return self.search_from if mode == SEARCH else mode
+
+    def rect_for(self, mode):
+        return getattr(self.layout(), MODE_SHAPES[self.underlying(mode)])
+
+    def animating(self):
+        return self.anim.state() == QPropertyAnimation.Running
+
+    def set_mode(self, mode):
+        if mode == self.mode:
+            return False
+        if mode == SEARCH:
+            self.search_from = self.mode if self.mode != COLLAPSED else STANDARD
+        old, self.mode = self.mode, mode
+        self.changed.emit(old, mode)
+        self._animate_to(self.rect_for(mode))
+        return True
+
+    def relayout(self):
+        # The layout changed (resolution, display); keep the mode, move to its new shape
+        rect = self.rect_for(self.mode)
+        self.anim.setEndValue(rect)
+        if not self.animating():
+            self.widget.setGeometry(rect)
+
+    def _animate_to(self, rect):
+        # The end value, not the geometry, says where the island is headed or resting: Qt may
+        # hold the widget slightly larger than a shape when it enforces a minimum size
+        if self.anim.endValue() == rect:
+            if not self.animating():
+                self.settled.emit(self.mode)
+            return
+        if self.animating():
+            # Interrupted: carry on from here, taking only as long as the remaining distance needs.
+            # currentValue() rather than geometry(), which Qt clamps to the minimum size
+            current = self.anim.currentValue()
+            travel = max(1, distance(self.anim.startValue(), self.anim.endValue()))
+            duration = int(self.duration * min(1.0, distance(current, rect) / travel))
+            self.anim.stop()
+            self.anim.setDuration(max(MIN_DURATION_MS, duration))
+        else:
+            current = self.anim.endValue()
+            self.anim.setDuration(self.duration)
+        self.anim.setStartValue(current)
+        self.anim.setEndValue(rect)
+        self.anim.start()
+
+    def _on_finished(self):
+        self.settled.emit(self.mode)
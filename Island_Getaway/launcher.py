@@ -0,0 +1,107 @@
+# python
+# Quick-launch apps from the island's bottom bar
+# Hovering schedules a launch after a short dwell (debounce); leaving cancels it.
+# A launch that is pending, still starting, or inside its cooldown window is not repeated,
+# so sweeping the cursor across an icon no longer spawns a process per event.
+
+import sys
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+DEFAULT_DEBOUNCE_MS = 250
+DEFAULT_COOLDOWN_MS = 3000
+
+
+class OpenBackend:
+    # macOS: open -a <App>
+    def launch(self, app):
+        import subprocess
+        return subprocess.Popen(['open', '-a', app])
+
+
+class ExecBackend:
+    # Other platforms: run the app name as a command
+    def launch(self, app):
+        import subprocess
+        return subprocess.Popen([app.lower()], start_new_session=True)
+
+
+class RecordingBackend:
+    # Records launches instead of starting anything (for testing on any platform)
+    def __init__(self):
+        self.launched = []
+
+    def launch(self, app):
+        self.launched.append(app)
+        return None
+
+
+def default_backend():
+    return OpenBackend() if sys.platform == 'darwin' else ExecBackend()
+
+
+class AppLauncher(QObject):
+    launched = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, backend=None, debounce_ms=DEFAULT_DEBOUNCE_MS,
+                 cooldown_ms=DEFAULT_COOLDOWN_MS, clock=time.monotonic):
+        super().__init__(parent)
+        self.backend = backend or default_backend()
+        self.debounce_ms = debounce_ms
+        self.cooldown_ms = cooldown_ms
+        self.clock = clock
+        self._pending = {}       # app -> single-shot QTimer
+        self._last_launch = {}   # app -> clock() of the last launch
+        self._processes = {}     # app -> Popen of a launch that may still be starting
+
+    def request(self, app):
+        # Debounced launch, e.g. on hover
+        if app in self._pending or not self._can_launch(app):
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._fire(app))
+        self._pending[app] = timer
+        timer.start(self.debounce_ms)
+
+    def cancel(self, app):
+        timer = self._pending.pop(app, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+
+    def launch_now(self, app):
+        # Immediate launch, e.g. on click; still deduplicated and rate limited
+        self.cancel(app)
+        if self._can_launch(app):
+            self._launch(app)
+
+    def is_pending(self, app):
+        return app in self._pending
+
+    def _fire(self, app):
+        timer = self._pending.pop(app, None)
+        if timer is not None:
+            timer.deleteLater()
+        if self._can_launch(app):
+            self._launch(app)
+
+    def _can_launch(self, app):
+        process = self._processes.get(app)
+        if process is not None and process.poll() is None:
+            return False
+        last = self._last_launch.get(app)
+        return last is None or (self.clock() - last) * 1000 >= self.cooldown_ms
+
+    def _launch(self, app):
+        self._last_launch[app] = self.clock()
+        try:
+            process = self.backend.launch(app)
+        except OSError as e:
+            print(f"Launch of {app} failed: {e}")
+            self.failed.emit(app, str(e))
+            return
+        if process is not None:
+            self._processes[app] = process
+        self.launched.emit(app)
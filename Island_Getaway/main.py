@@ -2,11 +2,134 @@
 # Dynamic Island-like effect for MacBook Pro notch area
 # Requires: pip install PyQt5
 
+import time
+LAUNCH_TIME = time.perf_counter()
+
+import os
 import sys
+import signal
+import argparse
+from PyQt5.QtCore import QTimer, QSocketNotifier
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QSizePolicy, QPushButton, QHBoxLayout
-from IslandGetaway import DynamicIsland
+from IslandGetaway import DynamicIsland, IslandManager
+from startup_profile import StartupProfiler, import_time_report
+from profiler import FrameProfiler, ProfilingApplication, profile_path_from_env, DEFAULT_TRACE_FILE
+from watchdog import StallWatchdog, threshold_from_env, DEFAULT_THRESHOLD_MS
+from app_paths import data_path
+from theme import THEMES, theme_from_env
+
+
+def http_metrics_report():
+    # http_client pulls in requests, which stays off the startup path until weather is fetched
+    from http_client import metrics_report
+    return metrics_report()
+
+
+def quit_on_signals(app, signals=(signal.SIGINT, signal.SIGTERM)):
+    # Ctrl+C and kill quit through app.quit(), so aboutToQuit handlers (profile dump, watchdog,
+    # running commands) still run. Python runs signal handlers only between bytecodes, and while
+    # the island is hidden the GUI thread sits in Qt's event loop running none, so the signal
+    # also writes a byte to a pipe Qt watches; reading it wakes the loop and lets the handler run.
+    # Repeats are harmless (a signal may reach both the process and its group), and every
+    # aboutToQuit handler gives up after a bounded wait, so quitting cannot hang.
+    if sys.platform == 'win32':
+        import socket   # set_wakeup_fd only takes sockets there; a pipe elsewhere spares the import
+        receiver, sender = socket.socketpair()
+        receiver.setblocking(False)
+        sender.setblocking(False)
+        read_fd, write_fd, read = receiver.fileno(), sender.fileno(), receiver.recv
+    else:
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        receiver = sender = None
+
+        def read(size):
+            return os.read(read_fd, size)
+
+    signal.set_wakeup_fd(write_fd)
+    notifier = QSocketNotifier(read_fd, QSocketNotifier.Read, app)
+    notifier.sockets = (receiver, sender)   # kept open for as long as the notifier lives
+
+    def drain():
+        try:
+            read(64)
+        except OSError:
+            pass
+
+    def on_signal(signum, frame):
+        app.quit()
+
+    notifier.activated.connect(drain)
+    for signum in signals:
+        signal.signal(signum, on_signal)
+    return notifier
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Dynamic Island for the notch area")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print how long it takes to reach a running, hover-ready island")
+    parser.add_argument('--import-report', action='store_true',
+                        help="print the -X importtime cost of the island and exit non-zero if over budget")
+    parser.add_argument('--all-screens', action='store_true',
+                        help="show an island on every attached display, not just the primary one")
+    parser.add_argument('--lazy-weather', action='store_true',
+                        help="wait until the island is first revealed before fetching weather")
+    parser.add_argument('--theme', choices=sorted(THEMES), default=theme_from_env().name,
+                        help="colour theme for the island (also set by ISLAND_THEME)")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE_FILE, default=profile_path_from_env(),
+                        metavar='PATH',
+                        help="record paint/frame timings, event-loop stalls and long slot calls, "
+                             "written to PATH on exit (also enabled by ISLAND_PROFILE=PATH)")
+    parser.add_argument('--watchdog', nargs='?', type=int, const=DEFAULT_THRESHOLD_MS, default=threshold_from_env(),
+                        metavar='MS',
+                        help="log the GUI thread's stack whenever the event loop stalls for MS milliseconds "
+                             "(also enabled by ISLAND_WATCHDOG_MS=MS)")
+    # Unknown arguments are passed through to Qt
+    return parser.parse_known_args(argv[1:])
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    island = DynamicIsland()
+    args, qt_args = parse_args(sys.argv)
+    if args.import_report:
+        report, ok = import_time_report()
+        print(report)
+        sys.exit(0 if ok else 1)
+    profiler = StartupProfiler(LAUNCH_TIME) if args.startup_profile else None
+    if profiler:
+        profiler.mark('imports')
+    app_class = ProfilingApplication if args.profile else QApplication
+    app = app_class(sys.argv[:1] + qt_args)
+    quit_on_signals(app)
+    if profiler:
+        profiler.mark('QApplication')
+    frame_profiler = None
+    if args.profile:
+        frame_profiler = FrameProfiler(args.profile)
+        frame_profiler.install(app)
+    if args.watchdog:
+        watchdog = StallWatchdog(args.watchdog, log_path=data_path('watchdog.log'))
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
+    if args.all_screens:
+        islands = IslandManager(lazy_weather=args.lazy_weather, profiler=frame_profiler,
+                                theme=THEMES[args.theme])
+        island = islands.primary
+    else:
+        island = DynamicIsland(lazy_weather=args.lazy_weather, profiler=frame_profiler,
+                               theme=THEMES[args.theme])
+    if frame_profiler:
+        frame_profiler.add_section('weather providers', island.weather_service.providers.status)
+        frame_profiler.add_section('http', http_metrics_report)
+    if profiler:
+        profiler.mark('DynamicIsland()')
+
+        def report():
+            profiler.mark('event loop running')
+            built = ', '.join(f"{name} ({ms:.1f} ms)" for name, ms in island.panel_build_ms.items())
+            profiler.note('panels built at startup', built or 'none (built on first use)')
+            print(profiler.report())
+
+        QTimer.singleShot(0, report)
     sys.exit(app.exec_())
@@ -0,0 +1,85 @@
+# python
+# Local stand-in for the weather providers, for offline development, bench.py and failover checks
+# Serves wttr.in j1 and format=3 responses and Open-Meteo /v1/forecast from canned data:
+#
+#   python mock_weather_server.py --port 8765 --delay-ms 800 --fail wttr
+#   ISLAND_WTTR_URL=http://127.0.0.1:8765 ISLAND_OPEN_METEO_URL=http://127.0.0.1:8765 python main.py
+
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SAMPLE_J1 = {
+    'current_condition': [{
+        'temp_C': '21', 'temp_F': '70', 'humidity': '40', 'windspeedKmph': '11',
+        'weatherCode': '116', 'weatherDesc': [{'value': 'Partly cloudy'}],
+    }],
+    'nearest_area': [{'areaName': [{'value': 'Pittsburgh'}],
+                      'country': [{'value': 'United States of America'}],
+                      'latitude': '40.441', 'longitude': '-79.996'}],
+}
+SAMPLE_FORMAT3 = 'Pittsburgh: ⛅️  +21°C\n'
+SAMPLE_OPEN_METEO = {
+    'latitude': 40.44, 'longitude': -79.99,
+    'current': {'temperature_2m': 21.4, 'relative_humidity_2m': 40, 'wind_speed_10m': 11.2, 'weather_code': 2},
+}
+
+
+class MockWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    delay_ms = 0
+    failing = frozenset()  # provider names ('wttr', 'open-meteo') that answer 503
+
+    def do_GET(self):
+        provider = 'open-meteo' if self.path.startswith('/v1/forecast') else 'wttr'
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        if provider in self.failing:
+            status, body, ctype = 503, b'Service Unavailable', 'text/plain'
+        elif provider == 'open-meteo':
+            status, body, ctype = 200, json.dumps(SAMPLE_OPEN_METEO).encode(), 'application/json'
+        elif 'format=j1' in self.path:
+            status, body, ctype = 200, json.dumps(SAMPLE_J1).encode(), 'application/json'
+        else:
+            status, body, ctype = 200, SAMPLE_FORMAT3.encode(), 'text/plain; charset=utf-8'
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port=0, delay_ms=0, failing=()):
+    # Serves on a daemon thread; returns the server (its port is server.server_port)
+    handler = type('Handler', (MockWeatherHandler,), {'delay_ms': delay_ms, 'failing': frozenset(failing)})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve canned weather responses locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay-ms', type=int, default=0, help="delay every response")
+    parser.add_argument('--fail', action='append', default=[], choices=('wttr', 'open-meteo'),
+                        help="answer 503 for this provider (repeatable)")
+    args = parser.parse_args(argv)
+    server = start_server(args.port, args.delay_ms, args.fail)
+    url = f'http://127.0.0.1:{server.server_port}'
+    print(f"Serving mock weather on {url}\n"
+          f"  ISLAND_WTTR_URL={url} ISLAND_OPEN_METEO_URL={url} python main.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
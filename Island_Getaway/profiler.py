@@ -0,0 +1,183 @@
+# python
+# Frame-timing instrumentation for the Dynamic Island
+# Enable with `python main.py --profile [PATH]` or ISLAND_PROFILE=PATH. When the app quits,
+# which includes Ctrl+C and SIGTERM (main.py turns both into app.quit()), a JSON file is written
+# with histograms and a trace that chrome://tracing or https://ui.perfetto.dev can open.
+#
+# Recorded:
+#   paint        - duration of every island paintEvent
+#   frame        - interval between painted frames while a geometry animation is running
+#   loop stall   - how late a 16 ms heartbeat timer fired (event loop not servicing events)
+#   long call    - any single event/slot dispatch that took longer than LONG_CALL_MS
+
+import os
+import json
+import time
+import atexit
+from PyQt5.QtCore import QObject, QTimer, QAbstractAnimation
+from PyQt5.QtWidgets import QApplication
+
+PROFILE_ENV = 'ISLAND_PROFILE'
+DEFAULT_TRACE_FILE = 'island_profile.json'
+FRAME_BUDGET_MS = 1000 / 60
+HEARTBEAT_MS = 16
+STALL_THRESHOLD_MS = 8     # heartbeat lateness reported as a stall
+LONG_CALL_MS = 16          # a single dispatch longer than a frame
+MAX_TRACE_EVENTS = 200000
+HISTOGRAM_BUCKETS_MS = (1, 2, 4, 8, 16, 33, 66, 133, 266, 533, 1000)
+
+
+def profile_path_from_env():
+    return os.environ.get(PROFILE_ENV) or None
+
+
+def histogram(values):
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for v in values:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if v < bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<{b}ms" for b in HISTOGRAM_BUCKETS_MS] + [f">={HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+def summarize(values):
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(sum(ordered) / len(ordered), 3),
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'max_ms': round(ordered[-1], 3),
+        'histogram': histogram(ordered),
+    }
+
+
+class FrameProfiler(QObject):
+    def __init__(self, path=DEFAULT_TRACE_FILE, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.start = time.perf_counter()
+        self.series = {'paint': [], 'frame': [], 'loop stall': [], 'long call': []}
+        self.trace = []
+        self.dropped_frames = 0
+        self._running_animations = 0
+        self._last_frame = None
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+        self._last_beat = None
+        self._dumped = False
+        self.sections = {}     # name -> callable returning more JSON for the summary
+
+    def _now_us(self, t=None):
+        return ((t if t is not None else time.perf_counter()) - self.start) * 1e6
+
+    def _event(self, name, category, start, duration_ms, **args):
+        if len(self.trace) < MAX_TRACE_EVENTS:
+            self.trace.append({'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                               'ts': self._now_us(start), 'dur': duration_ms * 1000, 'args': args})
+
+    # --- hooks ---
+
+    def install(self, app=None):
+        app = app or QApplication.instance()
+        if isinstance(app, ProfilingApplication):
+            app.profiler = self
+        self._heartbeat.start()
+        app.aboutToQuit.connect(self.dump)
+        atexit.register(self._dump_once)
+
+    def add_section(self, name, source):
+        # Other subsystems' own stats, collected when the report is made
+        self.sections[name] = source
+
+    def _dump_once(self):
+        if not self._dumped:
+            self.dump()
+
+    def record_paint(self, name, start, end):
+        duration_ms = (end - start) * 1000
+        self.series['paint'].append(duration_ms)
+        self._event(name, 'paint', start, duration_ms)
+        if self._running_animations:
+            if self._last_frame is not None:
+                interval = (start - self._last_frame) * 1000
+                self.series['frame'].append(interval)
+                if interval > FRAME_BUDGET_MS * 1.5:
+                    self.dropped_frames += int(interval // FRAME_BUDGET_MS) - 1
+            self._last_frame = start
+
+    def record_call(self, name, start, end):
+        duration_ms = (end - start) * 1000
+        if duration_ms >= LONG_CALL_MS:
+            self.series['long call'].append(duration_ms)
+            self._event(name, 'long call', start, duration_ms)
+
+    def watch_animation(self, name, animation):
+        animation.stateChanged.connect(lambda new, old: self._on_animation_state(name, new, old))
+
+    def _on_animation_state(self, name, new, old):
+        now = time.perf_counter()
+        if new == QAbstractAnimation.Running and old != QAbstractAnimation.Running:
+            self._running_animations += 1
+            self._last_frame = None
+            self._event(f"{name} start", 'animation', now, 0)
+        elif old == QAbstractAnimation.Running and new != QAbstractAnimation.Running:
+            self._running_animations = max(0, self._running_animations - 1)
+            self._event(f"{name} stop", 'animation', now, 0)
+
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        if self._last_beat is not None:
+            late_ms = (now - self._last_beat) * 1000 - HEARTBEAT_MS
+            if late_ms >= STALL_THRESHOLD_MS:
+                self.series['loop stall'].append(late_ms)
+                self._event('event loop stall', 'loop stall', now - late_ms / 1000, late_ms)
+        self._last_beat = now
+
+    # --- output ---
+
+    def report(self):
+        summary = {name: summarize(values) for name, values in self.series.items()}
+        summary['dropped frames'] = self.dropped_frames
+        summary['session_s'] = round(time.perf_counter() - self.start, 3)
+        for name, source in self.sections.items():
+            summary[name] = source()
+        return summary
+
+    def dump(self, path=None):
+        path = path or self.path
+        self._dumped = True
+        # Temp file + rename like the weather cache, so a second Ctrl+C mid-write leaves no torn file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace, 'displayTimeUnit': 'ms', 'summary': self.report()}, f)
+        os.replace(tmp_path, path)
+        print(f"Profile written to {path}")
+        return path
+
+
+class ProfilingApplication(QApplication):
+    # Times every event dispatch (timers, input, queued signals) to catch long-running slots
+    def __init__(self, argv):
+        super().__init__(argv)
+        self.profiler = None
+
+    def notify(self, receiver, event):
+        start = time.perf_counter()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            end = time.perf_counter()
+            if self.profiler is not None and (end - start) * 1000 >= LONG_CALL_MS:
+                try:
+                    name = f"{type(receiver).__name__}:{receiver.objectName() or '-'} event {int(event.type())}"
+                except RuntimeError:  # receiver deleted while handling the event
+                    name = f"<deleted> event {int(event.type())}"
+                self.profiler.record_call(name, start, end)
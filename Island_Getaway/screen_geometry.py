@@ -0,0 +1,96 @@
+# python
+# Per-screen island geometry
+# Every rectangle the island needs (notch, island, detailed weather, terminal, search bubble)
+# is computed once per screen and cached. The cache is dropped for a screen when it is resized
+# or moved and when screens are plugged in or removed, and layout_changed tells the islands.
+
+from dataclasses import dataclass
+from PyQt5.QtCore import QObject, QRect, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+NOTCH_WIDTH_RATIO = 0.13    # of the screen width
+NOTCH_HEIGHT = 30
+ISLAND_WIDTH_RATIO = 2.2    # of the notch width
+ISLAND_EXTRA_HEIGHT = 60    # below the notch
+DETAILED_EXTRA_HEIGHT = 80  # below the island
+TERMINAL_EXTRA_HEIGHT = 120
+SEARCH_BUBBLE_HEIGHT = 56
+
+
+def search_bubble_rect(island_rect):
+    # The search bubble hangs just below whatever shape the island currently has
+    return QRect(island_rect.x() + 25, island_rect.y() + island_rect.height() - 12,
+                 island_rect.width() - 40, SEARCH_BUBBLE_HEIGHT)
+
+
+@dataclass(frozen=True)
+class IslandLayout:
+    screen: QRect
+    notch: QRect
+    island: QRect
+    detailed: QRect
+    terminal: QRect
+    search: QRect
+
+    @classmethod
+    def for_screen(cls, screen_rect):
+        # Rectangles are in global coordinates, so secondary screens get their own offsets
+        notch_width = int(screen_rect.width() * NOTCH_WIDTH_RATIO)
+        notch_x = screen_rect.x() + (screen_rect.width() - notch_width) // 2
+        top = screen_rect.y()
+        island_width = int(notch_width * ISLAND_WIDTH_RATIO)
+        island_height = NOTCH_HEIGHT + ISLAND_EXTRA_HEIGHT
+        island_x = notch_x - (island_width - notch_width) // 2
+        island = QRect(island_x, top, island_width, island_height)
+        return cls(
+            screen=QRect(screen_rect),
+            notch=QRect(notch_x, top, notch_width, NOTCH_HEIGHT),
+            island=island,
+            detailed=QRect(island_x, top, island_width, island_height + DETAILED_EXTRA_HEIGHT),
+            terminal=QRect(island_x, top, island_width, island_height + TERMINAL_EXTRA_HEIGHT),
+            search=search_bubble_rect(island),
+        )
+
+
+class GeometryManager(QObject):
+    layout_changed = pyqtSignal(object)   # QScreen whose layout was recomputed
+    screens_changed = pyqtSignal()        # a screen was added or removed, or the primary changed
+
+    def __init__(self, parent=None, app=None):
+        super().__init__(parent)
+        self.app = app or QApplication.instance()
+        self._layouts = {}
+        self.app.screenAdded.connect(self._on_screen_added)
+        self.app.screenRemoved.connect(self._on_screen_removed)
+        self.app.primaryScreenChanged.connect(lambda screen: self.screens_changed.emit())
+        for screen in self.app.screens():
+            self._watch(screen)
+
+    def screens(self):
+        return self.app.screens()
+
+    def primary(self):
+        return self.app.primaryScreen()
+
+    def layout(self, screen=None):
+        screen = screen or self.primary()
+        layout = self._layouts.get(screen)
+        if layout is None:
+            layout = IslandLayout.for_screen(screen.geometry())
+            self._layouts[screen] = layout
+        return layout
+
+    def _watch(self, screen):
+        screen.geometryChanged.connect(lambda rect, screen=screen: self._invalidate(screen))
+
+    def _invalidate(self, screen):
+        self._layouts.pop(screen, None)
+        self.layout_changed.emit(screen)
+
+    def _on_screen_added(self, screen):
+        self._watch(screen)
+        self.screens_changed.emit()
+
+    def _on_screen_removed(self, screen):
+        self._layouts.pop(screen, None)
+        self.screens_changed.emit()
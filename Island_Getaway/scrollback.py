@@ -0,0 +1,176 @@
+# python
+# Bounded scrollback for the terminal island
+# Output lines live in a fixed-size ring buffer (O(1) append, eviction and indexed access)
+# and are shown through a virtualized QListView that only lays out the visible rows.
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtWidgets import QListView, QAbstractItemView
+
+DEFAULT_MAX_LINES = 10000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+MAX_LINE_LENGTH = 1000  # longer lines are split into several rows
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        return self._items[(self._start + i) % self.capacity]
+
+    def __setitem__(self, i, value):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        self._items[(self._start + i) % self.capacity] = value
+
+    def append(self, value):
+        if self._size == self.capacity:
+            raise IndexError('ring buffer full')
+        self._items[(self._start + self._size) % self.capacity] = value
+        self._size += 1
+
+    def popleft(self):
+        if not self._size:
+            raise IndexError('ring buffer empty')
+        value = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % self.capacity
+        self._size -= 1
+        return value
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+
+def _line_bytes(line):
+    return len(line.encode('utf-8', 'replace')) + 1
+
+
+class ScrollbackModel(QAbstractListModel):
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, max_bytes=DEFAULT_MAX_BYTES, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._lines = RingBuffer(max_lines)
+        self._bytes = 0
+        self._open_line = False  # the last row has not seen its newline yet
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._lines[index.row()]
+        return None
+
+    def total_bytes(self):
+        return self._bytes
+
+    def text(self):
+        return '\n'.join(self._lines[i] for i in range(len(self._lines)))
+
+    def clear(self):
+        self.beginResetModel()
+        self._lines.clear()
+        self._bytes = 0
+        self._open_line = False
+        self.endResetModel()
+
+    def append(self, text):
+        if not text:
+            return
+        pieces = text.split('\n')
+        closes_line = pieces[-1] == ''
+        if closes_line:
+            pieces.pop()
+
+        # Continue a partial last line (output often arrives mid-line)
+        if self._open_line and pieces and len(self._lines):
+            last = self._lines[-1]
+            merged = last + pieces.pop(0)
+            head, rest = merged[:MAX_LINE_LENGTH], merged[MAX_LINE_LENGTH:]
+            self._bytes += _line_bytes(head) - _line_bytes(last)
+            self._lines[-1] = head
+            row = len(self._lines) - 1
+            self.dataChanged.emit(self.index(row), self.index(row))
+            if rest:
+                pieces.insert(0, rest)
+
+        rows = []
+        for piece in pieces:
+            while len(piece) > MAX_LINE_LENGTH:
+                rows.append(piece[:MAX_LINE_LENGTH])
+                piece = piece[MAX_LINE_LENGTH:]
+            rows.append(piece)
+        self._open_line = not closes_line
+        if not rows:
+            return
+        # Anything that would be evicted straight away is never inserted
+        rows = rows[-self.max_lines:]
+        incoming = sum(_line_bytes(r) for r in rows)
+        while len(rows) > 1 and incoming > self.max_bytes:
+            incoming -= _line_bytes(rows.pop(0))
+
+        self._evict(len(rows), incoming)
+        first = len(self._lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for row in rows:
+            self._lines.append(row)
+        self._bytes += incoming
+        self.endInsertRows()
+
+    def _evict(self, incoming_lines, incoming_bytes):
+        count = 0
+        size = len(self._lines)
+        freed = 0
+        while count < size and (size - count + incoming_lines > self.max_lines or
+                                self._bytes - freed + incoming_bytes > self.max_bytes):
+            freed += _line_bytes(self._lines[count])
+            count += 1
+        if not count:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        for _ in range(count):
+            self._lines.popleft()
+        self._bytes -= freed
+        self.endRemoveRows()
+
+
+class ScrollbackView(QListView):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        # Uniform rows without wrapping let Qt lay out only what is on screen
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self._at_bottom = True
+        model.rowsAboutToBeInserted.connect(self._remember_position)
+        model.rowsInserted.connect(self._follow_output)
+
+    def _remember_position(self, *args):
+        bar = self.verticalScrollBar()
+        self._at_bottom = bar.value() >= bar.maximum()
+
+    def _follow_output(self, *args):
+        # Only auto-scroll if the user had not scrolled up to read earlier output
+        if self._at_bottom:
+            self.scrollToBottom()
@@ -0,0 +1,144 @@
+# python
+# Frecency-ranked search history for the search bubble
+# Each query keeps a score that gains 1 per use and halves every HALF_LIFE seconds. Comparing
+# log2(score) + last_used / HALF_LIFE ranks entries the same way as their decayed scores do at
+# any moment, so the rank is stored once per use instead of being recomputed on every lookup.
+# Suggestions bisect a sorted list of lower-cased queries for the prefix range and take the best
+# ranked few. On disk the history is a HistoryLog of uses, compacted to one line per entry.
+
+import math
+import time
+import bisect
+import heapq
+import threading
+from app_paths import data_path
+from history_log import HistoryLog, BackgroundLoad
+
+HISTORY_FILE = 'search_history.jsonl'
+HALF_LIFE = 7 * 24 * 3600      # seconds for a use to count half as much
+DEFAULT_MAX_ENTRIES = 20000
+EVICT_FRACTION = 0.1           # evicted at once when full, so eviction is not paid per insert
+DEFAULT_LIMIT = 8
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+class HistoryEntry:
+    __slots__ = ('query', 'score', 'last_used', 'rank')
+
+    def __init__(self, query, score, last_used):
+        self.query = query
+        self.score = score
+        self.last_used = last_used
+        self.rank = math.log2(score) + last_used / HALF_LIFE
+
+    def use(self, now):
+        # A use logged out of order (clock changes) counts as happening at the latest use
+        now = max(now, self.last_used)
+        self.score = self.score * 2 ** (-(now - self.last_used) / HALF_LIFE) + 1
+        self.last_used = now
+        self.rank = math.log2(self.score) + now / HALF_LIFE
+
+
+class SearchHistory:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.path = path or data_path(HISTORY_FILE)
+        self.log = HistoryLog(self.path, 'Search history')
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = {}      # lower-cased query -> HistoryEntry
+        self._keys = []         # sorted lower-cased queries, the prefix index
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._loader = BackgroundLoad(self.load, 'island-history')
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load_in_background(self):
+        self._loader.start()
+
+    def loading(self):
+        return self._loader.pending()
+
+    def load(self):
+        # Replays the log, blocking until done
+        with self._lock:
+            if self._loaded:
+                return self
+            for record in self.log.replay():
+                self._replay(record)
+            self._keys = sorted(self._entries)
+            self._loaded = True
+            if len(self._entries) > self.max_entries:
+                self._evict()
+            self._loader.finish()
+        return self
+
+    def _replay(self, record):
+        # Like a torn line, a record of the wrong shape or with a bad score or time is skipped
+        if (not isinstance(record, list) or len(record) not in (2, 3) or not isinstance(record[0], str)
+                or not all(_number(value) for value in record[1:])):
+            return
+        key = record[0].lower()
+        if len(record) == 3:      # compacted entry: query, score, last_used
+            if record[1] > 0:
+                self._entries[key] = HistoryEntry(record[0], record[1], record[2])
+        else:                     # one use: query, time
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = HistoryEntry(record[0], 1.0, record[1])
+            else:
+                entry.query = record[0]
+                entry.use(record[1])
+
+    def record(self, query):
+        query = ' '.join(query.split())
+        if not query:
+            return
+        now = self.clock()
+        if self._loader.defer(self._record, query, now):
+            return
+        self.load()
+        with self._lock:
+            self._record(query, now)
+
+    def _record(self, query, now):
+        key = query.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = HistoryEntry(query, 1.0, now)
+            bisect.insort(self._keys, key)
+            if len(self._entries) > self.max_entries:
+                self._evict()
+        else:
+            entry.query = query
+            entry.use(now)
+        self.log.append([query, now], len(self._entries), self._records)
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        # Best ranked queries starting with prefix (case-insensitive), best first; none while loading
+        if self._loader.pending():
+            return []
+        self.load()
+        prefix = prefix.lstrip().lower()
+        if not prefix:
+            return []
+        keys, entries = self._keys, self._entries
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        candidates = (entries[keys[i]] for i in range(start, end))
+        return [e.query for e in heapq.nlargest(limit, candidates, key=lambda e: e.rank)]
+
+    def _evict(self):
+        # Drops the lowest ranked entries: rarely used and long unused ones go first
+        keep = max(1, int(self.max_entries * (1 - EVICT_FRACTION)))
+        survivors = heapq.nlargest(keep, self._entries.values(), key=lambda e: e.rank)
+        self._entries = {e.query.lower(): e for e in survivors}
+        self._keys = sorted(self._entries)
+        self.log.compact(self._records())
+
+    def _records(self):
+        return [[e.query, e.score, e.last_used] for e in self._entries.values()]
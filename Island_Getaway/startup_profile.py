@@ -0,0 +1,86 @@
+# python
+# Startup timing for the Dynamic Island (enabled with --startup-profile)
+# and an -X importtime report of the island's import cost (--import-report)
+
+import os
+import sys
+import time
+
+# Time from launch until the event loop is running and the notch is hover-ready
+STARTUP_TARGET_MS = 300
+# Cumulative import time of IslandGetaway, Qt included
+IMPORT_BUDGET_MS = 100
+# Modules that must stay off the startup path; they are loaded in the background
+DEFERRED_MODULES = ('requests', 'http_client', 'subprocess', 'webbrowser', 'command_runner', 'scrollback')
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def import_time_report(module='IslandGetaway', top=15, budget_ms=IMPORT_BUDGET_MS):
+    # Imports the module in a fresh interpreter under -X importtime.
+    # Returns (report text, within budget and no deferred module imported eagerly).
+    import subprocess
+    code = (f"import sys, {module}; "
+            f"sys.stdout.write(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        entries.append((int(cumulative_us) / 1000, int(self_us) / 1000, name.rstrip()))
+    total_ms = next((cum for cum, _, name in entries if name.strip() == module), 0.0)
+    eager = [m for m in result.stdout.split(',') if m]
+
+    lines = [f"Import report for {module}:"]
+    for cumulative_ms, self_ms, name in sorted(entries, key=lambda e: -e[0])[:top]:
+        lines.append(f"  {cumulative_ms:8.1f} ms cumulative {self_ms:7.1f} ms self  {name}")
+    if result.returncode != 0:
+        lines.append(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    ok = result.returncode == 0 and total_ms <= budget_ms and not eager
+    lines.append(f"  eagerly imported deferred modules: {', '.join(eager) or 'none'}")
+    lines.append(f"  total {total_ms:.1f} ms / budget {budget_ms} ms: {'OK' if ok else 'FAIL'}")
+    return "\n".join(lines), ok
+
+
+class StartupProfiler:
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.marks = []
+        self.notes = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def note(self, name, value):
+        self.notes.append((name, value))
+
+    def elapsed_ms(self, name=None):
+        for mark_name, t in reversed(self.marks):
+            if name is None or mark_name == name:
+                return (t - self.start) * 1000
+        return 0.0
+
+    def report(self, target_ms=STARTUP_TARGET_MS):
+        lines = ["Startup profile:"]
+        prev = self.start
+        for name, t in self.marks:
+            lines.append(f"  {name:<28} +{(t - prev) * 1000:7.1f} ms  ({(t - self.start) * 1000:7.1f} ms total)")
+            prev = t
+        for name, value in self.notes:
+            lines.append(f"  {name:<28} {value}")
+        lines.append(f"  {'peak resident memory':<28} {peak_rss_mb():.1f} MB")
+        total = self.elapsed_ms()
+        status = "OK" if total <= target_ms else "OVER TARGET"
+        lines.append(f"  total {total:.1f} ms / target {target_ms} ms: {status}")
+        return "\n".join(lines)
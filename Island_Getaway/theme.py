@@ -0,0 +1,86 @@
+# python
+# Colors and fonts for the island
+# A theme is compiled once into a single stylesheet whose rules are keyed by object name, and is
+# applied to each top-level window (the island and the search bubble) once, instead of every
+# widget carrying its own inline stylesheet. Fonts are created once per theme and shared.
+# Pick a theme with `python main.py --theme light` or ISLAND_THEME=light.
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from PyQt5.QtGui import QFont, QColor
+
+THEME_ENV = 'ISLAND_THEME'
+DEFAULT_THEME = 'dark'
+
+# Font roles: (point size, bold); pixel sizes are marked with 'px'
+FONT_ROLES = {
+    'clock': (20, False),
+    'weather': (16, False),
+    'weather_detail': (16, True),
+    'icon': (20, False),
+    'terminal': (14, False),
+    'search': ('16px', False),
+}
+
+
+@dataclass(frozen=True)
+class Theme:
+    name: str
+    font_family: str = 'Arial'
+    island: str = '#000000'          # painted by BackgroundRenderer, not the stylesheet
+    text: str = 'white'
+    panel: str = '#111'
+    panel_border: str = '#222'
+    field: str = '#222'
+    field_border: str = '#333'
+    terminal_text: str = '#00FF00'
+    button: str = '#333'
+    search_field: str = '#000'
+
+    @property
+    def island_color(self):
+        return QColor(self.island)
+
+
+THEMES = {
+    'dark': Theme('dark'),
+    'light': Theme('light', island='#f2f2f7', text='#111', panel='#ffffff', panel_border='#d1d1d6',
+                   field='#f2f2f7', field_border='#c7c7cc', terminal_text='#1d6b2f', button='#e5e5ea',
+                   search_field='#ffffff'),
+}
+
+STYLESHEET = """
+#islandClock, #islandWeather {{ color: {text}; }}
+#quickLaunch {{ color: {text}; padding: 4px; border-radius: 8px; }}
+#internetButton {{ color: {text}; background: transparent; border: none; padding: 4px; border-radius: 8px; }}
+#terminalPanel {{ background: {panel}; border-radius: 8px; border: 1px solid {panel_border}; }}
+#terminalOutput, #terminalInput {{ color: {terminal_text}; background: {field}; border-radius: 4px;
+    padding: 8px; border: 1px solid {field_border}; }}
+#terminalSearch {{ color: {terminal_text}; }}
+#terminalBack {{ color: {text}; background: {button}; border-radius: 6px; padding: 6px; border: none; }}
+#searchBubble {{ background-color: {panel}; border-radius: 24px; border: 2px solid {panel_border}; padding: 8px; }}
+#searchBar {{ color: {text}; background: {search_field}; border-radius: 16px; border: none; padding: 10px 16px; }}
+"""
+
+
+def theme_from_env():
+    return THEMES.get(os.environ.get(THEME_ENV, DEFAULT_THEME), THEMES[DEFAULT_THEME])
+
+
+@lru_cache(maxsize=None)
+def stylesheet(theme):
+    return STYLESHEET.format(**theme.__dict__).strip()
+
+
+@lru_cache(maxsize=None)
+def font(theme, role):
+    # One QFont per theme and role, shared by every widget using it
+    size, bold = FONT_ROLES[role]
+    qfont = QFont(theme.font_family)
+    if isinstance(size, str):
+        qfont.setPixelSize(int(size[:-2]))
+    else:
+        qfont.setPointSize(size)
+    qfont.setBold(bold)
+    return qfont
@@ -0,0 +1,95 @@
+# python
+# Event-loop stall watchdog
+# The GUI thread bumps a heartbeat from a QTimer; a background thread checks it and, when the
+# loop has not serviced events for threshold_ms, captures the GUI thread's Python stack so the
+# blocking call can be attributed. Enable with `python main.py --watchdog [MS]` or
+# ISLAND_WATCHDOG_MS=MS.
+
+import os
+import sys
+import time
+import threading
+import traceback
+from datetime import datetime
+from PyQt5.QtCore import QObject, QTimer
+
+WATCHDOG_ENV = 'ISLAND_WATCHDOG_MS'
+DEFAULT_THRESHOLD_MS = 200
+HEARTBEAT_MS = 20
+
+
+def threshold_from_env():
+    value = os.environ.get(WATCHDOG_ENV)
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+class Stall:
+    def __init__(self, started_at, stack):
+        self.started_at = started_at   # wall clock, for the log
+        self.stack = stack             # GUI thread stack when the stall was detected
+        self.duration_ms = None        # filled in when the loop recovers
+
+
+class StallWatchdog(QObject):
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, log_path=None, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        self.stalls = []
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._current = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._beat)
+
+    def start(self):
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name='island-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def stall_count(self):
+        return len(self.stalls)
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _watch(self):
+        poll = max(self.threshold_ms / 4000, 0.005)
+        while not self._stop.wait(poll):
+            silent_ms = (time.monotonic() - self._last_beat) * 1000
+            if self._current is None and silent_ms >= self.threshold_ms + HEARTBEAT_MS:
+                frame = sys._current_frames().get(self._gui_thread_id)
+                stack = ''.join(traceback.format_stack(frame)) if frame is not None else '<no stack>\n'
+                self._current = Stall(time.time() - silent_ms / 1000, stack)
+                self.stalls.append(self._current)
+                self._log(f"event loop stalled for {silent_ms:.0f} ms, GUI thread is in:\n{stack}")
+            elif self._current is not None and silent_ms < HEARTBEAT_MS * 2:
+                self._current.duration_ms = (time.time() - self._current.started_at) * 1000
+                self._log(f"event loop recovered after {self._current.duration_ms:.0f} ms")
+                self._current = None
+
+    def _log(self, message):
+        line = f"[{datetime.now().isoformat(timespec='milliseconds')}] watchdog: {message}"
+        print(line, file=sys.stderr)
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(line if line.endswith('\n') else line + '\n')
+            except OSError:
+                pass
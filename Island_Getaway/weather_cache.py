@@ -0,0 +1,57 @@
+# python
+# In-process weather cache keyed by (location, format)
+# Entries younger than ttl are fresh and served without touching the network.
+# Older entries are still served (stale-while-revalidate) until max_stale, while a refresh runs.
+# The last good snapshot is also persisted to disk so a restart can show it immediately.
+
+import os
+import json
+import time
+from dataclasses import asdict
+from weather_model import WeatherSnapshot
+
+DEFAULT_TTL = 300          # seconds an entry is considered fresh
+DEFAULT_MAX_STALE = 3600   # seconds a stale entry may still be shown while revalidating
+
+
+class WeatherCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_stale=DEFAULT_MAX_STALE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self._entries = {}
+
+    def lookup(self, location, fmt):
+        # Returns (value, is_fresh); value is None when there is nothing usable
+        entry = self._entries.get((location, fmt))
+        if entry is None:
+            return None, False
+        value, stored_at = entry
+        age = self.clock() - stored_at
+        if age > self.max_stale:
+            del self._entries[(location, fmt)]
+            return None, False
+        return value, age <= self.ttl
+
+    def store(self, location, fmt, value, age=0.0):
+        self._entries[(location, fmt)] = (value, self.clock() - age)
+
+
+def save_snapshot(path, location, snapshot):
+    # Written to a temp file and renamed so a crash never leaves a half-written cache
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'location': location, 'snapshot': asdict(snapshot)}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path, location):
+    # Returns the persisted snapshot for this location, or None if missing/corrupt
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('location') != location:
+            return None
+        return WeatherSnapshot(**data['snapshot'])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
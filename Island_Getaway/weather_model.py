@@ -0,0 +1,141 @@
+# python
+# Structured weather data built from a single provider response (wttr.in j1, Open-Meteo, ...)
+# Both the compact label and the detailed view are rendered from the same snapshot
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# wttr.in (WWO) condition codes -> emoji, same mapping wttr.in uses for its one-line formats
+_SUNNY, _PARTLY, _CLOUDY, _FOG = '☀️', '⛅️', '☁️', '🌫'
+_LIGHT_RAIN, _HEAVY_RAIN, _SLEET = '🌦', '🌧', '🌧'
+_LIGHT_SNOW, _HEAVY_SNOW = '🌨', '❄️'
+_THUNDER, _THUNDER_RAIN = '⛈', '🌩'
+_UNKNOWN = '✨'
+
+WEATHER_EMOJI = {
+    113: _SUNNY, 116: _PARTLY, 119: _CLOUDY, 122: _CLOUDY,
+    143: _FOG, 248: _FOG, 260: _FOG,
+    176: _LIGHT_RAIN, 263: _LIGHT_RAIN, 266: _LIGHT_RAIN, 293: _LIGHT_RAIN, 296: _LIGHT_RAIN, 353: _LIGHT_RAIN,
+    299: _HEAVY_RAIN, 302: _HEAVY_RAIN, 305: _HEAVY_RAIN, 308: _HEAVY_RAIN, 356: _HEAVY_RAIN, 359: _HEAVY_RAIN,
+    179: _SLEET, 182: _SLEET, 185: _SLEET, 281: _SLEET, 284: _SLEET, 311: _SLEET, 314: _SLEET,
+    317: _SLEET, 350: _SLEET, 362: _SLEET, 365: _SLEET, 374: _SLEET, 377: _SLEET,
+    227: _LIGHT_SNOW, 320: _LIGHT_SNOW, 323: _LIGHT_SNOW, 326: _LIGHT_SNOW, 368: _LIGHT_SNOW,
+    230: _HEAVY_SNOW, 329: _HEAVY_SNOW, 332: _HEAVY_SNOW, 335: _HEAVY_SNOW, 338: _HEAVY_SNOW,
+    371: _HEAVY_SNOW, 395: _HEAVY_SNOW,
+    200: _THUNDER, 386: _THUNDER, 392: _THUNDER, 389: _THUNDER_RAIN,
+}
+
+# Reverse lookup for one-line responses that only carry the emoji
+EMOJI_CODES = {}
+for _code, _emoji in WEATHER_EMOJI.items():
+    EMOJI_CODES.setdefault(_emoji.rstrip('\ufe0f'), _code)
+EMOJI_CODES[_UNKNOWN] = 0
+
+# wttr.in reports these countries in Fahrenheit by default
+_FAHRENHEIT_COUNTRIES = {'United States of America', 'Liberia', 'Myanmar'}
+
+
+def celsius_to_fahrenheit(temp_c):
+    return round(temp_c * 9 / 5 + 32)
+
+
+def fahrenheit_to_celsius(temp_f):
+    return round((temp_f - 32) * 5 / 9)
+
+
+@dataclass(frozen=True)
+class WeatherSnapshot:
+    location: str
+    temp_c: int
+    temp_f: int
+    humidity: Optional[int]   # None when the provider does not report it
+    wind_kmph: Optional[int]
+    description: str
+    weather_code: int
+    use_fahrenheit: bool = False
+    fetched_at: float = 0.0
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @classmethod
+    def from_j1(cls, data, fetched_at=None):
+        current = data['current_condition'][0]
+        area = (data.get('nearest_area') or [{}])[0]
+        city = (area.get('areaName') or [{}])[0].get('value', '')
+        country = (area.get('country') or [{}])[0].get('value', '')
+        try:
+            latitude, longitude = float(area['latitude']), float(area['longitude'])
+        except (KeyError, ValueError):
+            latitude = longitude = None
+        return cls(
+            location=city,
+            temp_c=int(current['temp_C']),
+            temp_f=int(current['temp_F']),
+            humidity=int(current['humidity']),
+            wind_kmph=int(current['windspeedKmph']),
+            description=current['weatherDesc'][0]['value'].strip(),
+            weather_code=int(current['weatherCode']),
+            use_fahrenheit=country in _FAHRENHEIT_COUNTRIES,
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+    @classmethod
+    def from_line(cls, line, fetched_at=None):
+        # From a one-line WeatherLine (format=3); humidity and wind are unknown
+        if line.unit == 'F':
+            temp_f, temp_c = line.temperature, fahrenheit_to_celsius(line.temperature)
+        else:
+            temp_c, temp_f = line.temperature, celsius_to_fahrenheit(line.temperature)
+        return cls(
+            location=line.location,
+            temp_c=temp_c,
+            temp_f=temp_f,
+            humidity=None,
+            wind_kmph=None,
+            description='',
+            weather_code=EMOJI_CODES.get(line.emoji.rstrip('\ufe0f'), 0),
+            use_fahrenheit=line.unit == 'F',
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+        )
+
+    @property
+    def emoji(self):
+        return WEATHER_EMOJI.get(self.weather_code, _UNKNOWN)
+
+    @property
+    def temperature(self):
+        return f"{self.temp_f}°F" if self.use_fahrenheit else f"{self.temp_c}°C"
+
+    def age(self, now=None):
+        return max(0.0, (now if now is not None else time.time()) - self.fetched_at)
+
+    def age_text(self, now=None):
+        minutes = int(self.age(now) // 60)
+        if minutes < 60:
+            return f"{minutes}m ago"
+        if minutes < 24 * 60:
+            return f"{minutes // 60}h ago"
+        return f"{minutes // (24 * 60)}d ago"
+
+    def summary_text(self, stale_after=None, now=None):
+        # A snapshot older than stale_after seconds gets an age marker, e.g. "70°F ⛅️ · 3h ago"
+        text = f"{self.temperature} {self.emoji}"
+        if stale_after is not None and self.age(now) > stale_after:
+            text += f" · {self.age_text(now)}"
+        return text
+
+    def details_text(self, stale_after=None, now=None):
+        lines = [f"Temperature: {self.temperature}"]
+        if self.humidity is not None:
+            lines.append(f"Humidity: {self.humidity}%")
+        if self.wind_kmph is not None:
+            lines.append(f"Wind: {self.wind_kmph} km/h")
+        if self.description:
+            lines.append(f"Forecast: {self.description}")
+        text = "\n".join(lines)
+        if stale_after is not None and self.age(now) > stale_after:
+            text += f"\nUpdated {self.age_text(now)}"
+        return text
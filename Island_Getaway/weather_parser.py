@@ -0,0 +1,136 @@
+# python
+# Parsers for weather provider responses (wttr.in j1 and format=3, Open-Meteo)
+# Patterns are compiled once at import. The one-line format=3 response
+# ("Pittsburgh: ⛅️  +21°C") goes through a split-based fast path and only falls back to the
+# regexes when the line does not have the usual shape.
+
+import re
+import json
+import time
+from typing import NamedTuple
+from weather_model import WeatherSnapshot, celsius_to_fahrenheit
+
+# Unicode blocks wttr.in draws its condition symbols from
+EMOJI_RANGES = (
+    (0x1F300, 0x1FAFF),  # pictographs: 🌦 🌧 🌨 🌩 🌫 ...
+    (0x2600, 0x26FF),    # misc symbols: ☀ ☁ ⛅ ⛈ ...
+    (0x2700, 0x27BF),    # dingbats: ✨ ❄ ...
+)
+TEMPERATURE_UNITS = {'°C': 'C', '°F': 'F'}
+VARIATION_SELECTOR = '\ufe0f'
+
+# Open-Meteo WMO weather codes -> (wttr.in/WWO code, description), so snapshots from either
+# provider share the emoji table
+WMO_CODES = {
+    0: (113, 'Clear sky'), 1: (116, 'Mainly clear'), 2: (116, 'Partly cloudy'), 3: (122, 'Overcast'),
+    45: (248, 'Fog'), 48: (260, 'Freezing fog'),
+    51: (266, 'Light drizzle'), 53: (266, 'Drizzle'), 55: (266, 'Heavy drizzle'),
+    56: (281, 'Freezing drizzle'), 57: (284, 'Heavy freezing drizzle'),
+    61: (296, 'Light rain'), 63: (302, 'Rain'), 65: (308, 'Heavy rain'),
+    66: (311, 'Freezing rain'), 67: (314, 'Heavy freezing rain'),
+    71: (326, 'Light snow'), 73: (332, 'Snow'), 75: (338, 'Heavy snow'), 77: (326, 'Snow grains'),
+    80: (353, 'Light showers'), 81: (356, 'Showers'), 82: (359, 'Violent showers'),
+    85: (368, 'Light snow showers'), 86: (371, 'Snow showers'),
+    95: (386, 'Thunderstorm'), 96: (389, 'Thunderstorm with hail'), 99: (389, 'Thunderstorm with heavy hail'),
+}
+
+TEMP_RE = re.compile(r'([+-]?\d+)\s*°\s*([CF])')
+EMOJI_RE = re.compile('[' + ''.join(f'{chr(lo)}-{chr(hi)}' for lo, hi in EMOJI_RANGES) + ']' + VARIATION_SELECTOR + '?')
+
+
+class WeatherLine(NamedTuple):
+    location: str
+    emoji: str
+    temperature: int
+    unit: str
+
+
+def is_weather_emoji(text):
+    # A single condition symbol, optionally followed by the emoji variation selector
+    if not text or len(text) > 2 or (len(text) == 2 and text[1] != VARIATION_SELECTOR):
+        return False
+    code = ord(text[0])
+    for lo, hi in EMOJI_RANGES:
+        if lo <= code <= hi:
+            return True
+    return False
+
+
+def _parse_temperature(token):
+    unit = TEMPERATURE_UNITS.get(token[-2:])
+    if unit is None:
+        return None
+    number = token[:-2]
+    digits = number[1:] if number[:1] in ('+', '-') else number
+    # int() alone would also take "1_0" and non-ASCII digits, which the regex path rejects
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return int(number), unit
+
+
+def parse_format3(text):
+    # Returns a WeatherLine, or None if the text has no temperature
+    line = text.strip()
+    location, sep, rest = line.rpartition(': ')
+    if sep:
+        tokens = rest.split()
+        if len(tokens) == 2 and is_weather_emoji(tokens[0]):
+            temperature = _parse_temperature(tokens[1])
+            if temperature is not None:
+                return WeatherLine(location, tokens[0], *temperature)
+    return _parse_format3_slow(line)
+
+
+def _parse_format3_slow(line):
+    location, sep, rest = line.rpartition(':')
+    fields = rest if sep else line
+    temp_match = TEMP_RE.search(fields)
+    if temp_match is None:
+        return None
+    emoji_match = EMOJI_RE.search(fields)
+    return WeatherLine(location.strip(), emoji_match.group(0) if emoji_match else '',
+                       int(temp_match.group(1)), temp_match.group(2))
+
+
+def parse_j1(text):
+    # Returns a WeatherSnapshot, or None for malformed payloads
+    try:
+        return WeatherSnapshot.from_j1(json.loads(text))
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+def parse_open_meteo(text, location='', use_fahrenheit=False):
+    # Open-Meteo /v1/forecast with current=temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code.
+    # The response has coordinates but no place name, so the caller supplies it.
+    try:
+        data = json.loads(text)
+        current = data['current']
+        temp_c = round(float(current['temperature_2m']))
+        code, description = WMO_CODES.get(int(current['weather_code']), (0, ''))
+        return WeatherSnapshot(
+            location=location,
+            temp_c=temp_c,
+            temp_f=celsius_to_fahrenheit(temp_c),
+            humidity=round(float(current['relative_humidity_2m'])),
+            wind_kmph=round(float(current['wind_speed_10m'])),
+            description=description,
+            weather_code=code,
+            use_fahrenheit=use_fahrenheit,
+            fetched_at=time.time(),
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude'),
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def parse_any(text):
+    # Sniffs the response type, for sources that may hold any of the formats (e.g. a local file)
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        if '"current_condition"' in stripped:
+            return parse_j1(stripped)
+        return parse_open_meteo(stripped)
+    line = parse_format3(stripped)
+    return WeatherSnapshot.from_line(line) if line is not None else None
@@ -0,0 +1,289 @@
+# python
+# Weather providers and failover between them
+# Each provider turns a location into a WeatherSnapshot. ProviderChain tries them in order of
+# preference, skips providers whose circuit breaker is open, and gives each one a timeout based
+# on its recent latency, so a slow or dead provider stops costing a full timeout on every refresh.
+#
+#   ISLAND_WEATHER_PROVIDERS=wttr,open-meteo,file   providers to use, most preferred first
+#   ISLAND_WTTR_URL / ISLAND_OPEN_METEO_URL         point a provider at another server (e.g. the mock)
+#   ISLAND_WEATHER_FILE=PATH                        j1, Open-Meteo or format=3 response read from disk
+#   ISLAND_COORDINATES=LAT,LON                      location for providers that need coordinates
+
+import os
+import time
+import threading
+from collections import deque
+from weather_parser import parse_j1, parse_open_meteo, parse_any
+
+PROVIDERS_ENV = 'ISLAND_WEATHER_PROVIDERS'
+DEFAULT_PROVIDERS = 'wttr,open-meteo'
+WTTR_BASE_URL = os.environ.get('ISLAND_WTTR_URL', 'https://wttr.in').rstrip('/')
+OPEN_METEO_URL = os.environ.get('ISLAND_OPEN_METEO_URL', 'https://api.open-meteo.com').rstrip('/')
+WEATHER_FILE_ENV = 'ISLAND_WEATHER_FILE'
+COORDINATES_ENV = 'ISLAND_COORDINATES'
+FALLBACK_LOCATION = 'Pittsburgh'
+FALLBACK_COORDINATES = (40.44, -79.99)  # Pittsburgh
+
+MAX_TIMEOUT = 5.0       # seconds, also used until a provider has a latency history
+MIN_TIMEOUT = 1.0
+TIMEOUT_FACTOR = 4      # timeout = TIMEOUT_FACTOR x the provider's p95 latency, clamped to the above
+FAILURE_THRESHOLD = 3   # consecutive failures before a provider's circuit opens
+OPEN_SECONDS = 60       # first cool-down; doubles after each failed trial request, up to MAX_OPEN_SECONDS
+MAX_OPEN_SECONDS = 900
+
+
+class ProviderError(Exception):
+    pass
+
+
+class RateLimited(ProviderError):
+    # The provider asked us to back off (429, or 503 with Retry-After) for retry_after seconds
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(value, default=OPEN_SECONDS):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime   # pulls in socket; only needed on a rate limit
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+def check_status(resp):
+    # Any answer but 200 is a failure; rate limits carry how long to stay away
+    if resp.status_code == 200:
+        return
+    retry_after = resp.headers.get('Retry-After')
+    if resp.status_code == 429 or retry_after:
+        raise RateLimited(f"HTTP {resp.status_code}", retry_after_seconds(retry_after))
+    raise ProviderError(f"HTTP {resp.status_code}")
+
+
+class WttrProvider:
+    name = 'wttr'
+
+    def __init__(self, base_url=WTTR_BASE_URL):
+        self.base_url = base_url
+
+    def fetch(self, client, location, timeout, previous=None):
+        # An empty location is resolved by wttr.in from the caller's IP, with a fixed fallback
+        # when that answer is unusable; an error status fails right away without the fallback
+        locations = (location, FALLBACK_LOCATION) if not location else (location,)
+        for loc in locations:
+            resp = client.get(f'{self.base_url}/{loc}?format=j1', timeout=timeout)
+            check_status(resp)
+            if resp.text.strip():
+                snapshot = parse_j1(resp.text)
+                if snapshot is not None:
+                    return snapshot
+        return None
+
+
+class OpenMeteoProvider:
+    # Needs coordinates: ISLAND_COORDINATES, else those of the last snapshot from any provider
+    name = 'open-meteo'
+
+    def __init__(self, base_url=OPEN_METEO_URL, coordinates=None):
+        self.base_url = base_url
+        self.coordinates = coordinates or coordinates_from_env()
+
+    def fetch(self, client, location, timeout, previous=None):
+        latitude, longitude = self._coordinates(previous)
+        url = (f'{self.base_url}/v1/forecast?latitude={latitude}&longitude={longitude}'
+               f'&current=temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code')
+        resp = client.get(url, timeout=timeout)
+        check_status(resp)
+        name = location or (previous.location if previous is not None else FALLBACK_LOCATION)
+        use_fahrenheit = previous.use_fahrenheit if previous is not None else False
+        return parse_open_meteo(resp.text, name, use_fahrenheit)
+
+    def _coordinates(self, previous):
+        if self.coordinates is not None:
+            return self.coordinates
+        if previous is not None and previous.latitude is not None:
+            return previous.latitude, previous.longitude
+        return FALLBACK_COORDINATES
+
+
+class FileProvider:
+    # Reads a saved response from disk; handy offline and for testing the failover path
+    name = 'file'
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(WEATHER_FILE_ENV)
+
+    def fetch(self, client, location, timeout, previous=None):
+        if not self.path:
+            return None
+        with open(self.path, encoding='utf-8') as f:
+            return parse_any(f.read())
+
+
+PROVIDER_TYPES = {cls.name: cls for cls in (WttrProvider, OpenMeteoProvider, FileProvider)}
+
+
+def coordinates_from_env():
+    value = os.environ.get(COORDINATES_ENV, '')
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+        return latitude, longitude
+    except ValueError:
+        return None
+
+
+def providers_from_env():
+    names = [n.strip() for n in os.environ.get(PROVIDERS_ENV, DEFAULT_PROVIDERS).split(',') if n.strip()]
+    if WEATHER_FILE_ENV in os.environ and 'file' not in names:
+        names.append('file')
+    providers = []
+    for name in names:
+        if name in PROVIDER_TYPES:
+            providers.append(PROVIDER_TYPES[name]())
+        else:
+            print(f"Unknown weather provider: {name}")
+    return providers or [WttrProvider()]
+
+
+class CircuitBreaker:
+    # closed: requests go through. open: skipped until the cool-down ends. half-open: one trial
+    # request is let through; success closes the circuit, failure reopens it for twice as long.
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, open_seconds=OPEN_SECONDS,
+                 max_open_seconds=MAX_OPEN_SECONDS, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.clock = clock
+        self.failures = 0
+        self.state = 'closed'
+        self._opened_at = 0.0
+        self._cool_down = open_seconds
+        self._open_for = open_seconds   # length of the current open period
+
+    def allow(self):
+        if self.state == 'open' and self.clock() - self._opened_at >= self._open_for:
+            self.state = 'half-open'
+            return True
+        return self.state == 'closed'
+
+    def record_success(self):
+        self.failures = 0
+        self.state = 'closed'
+        self._cool_down = self.open_seconds
+
+    def record_failure(self, retry_after=0.0):
+        # retry_after: how long the provider itself asked us to wait; it opens the circuit at once
+        self.failures += 1
+        if retry_after > 0:
+            self._open(retry_after)
+        elif self.state == 'half-open':
+            self._cool_down = min(self._cool_down * 2, self.max_open_seconds)
+            self._open()
+        elif self.state == 'closed' and self.failures >= self.failure_threshold:
+            self._open()
+
+    def retry_in(self):
+        # Seconds until an open circuit allows a trial request
+        if self.state != 'open':
+            return 0.0
+        return max(0.0, self._open_for - (self.clock() - self._opened_at))
+
+    def _open(self, duration=None):
+        self.state = 'open'
+        self._opened_at = self.clock()
+        self._open_for = self._cool_down if duration is None else duration
+
+
+class ProviderStats:
+    def __init__(self, max_samples=50):
+        self.latencies_ms = deque(maxlen=max_samples)  # successful fetches only
+        self.successes = 0
+        self.failures = 0
+        self.last_error = ''
+
+    def p95_ms(self):
+        times = sorted(self.latencies_ms)
+        return times[min(len(times) - 1, int(len(times) * 0.95))] if times else None
+
+    def timeout(self):
+        p95 = self.p95_ms()
+        if p95 is None or len(self.latencies_ms) < 3:
+            return MAX_TIMEOUT
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p95 / 1000 * TIMEOUT_FACTOR))
+
+
+class ProviderChain:
+    def __init__(self, providers=None, client=None, clock=time.monotonic):
+        self.providers = list(providers) if providers is not None else providers_from_env()
+        self.client = client
+        self.breakers = {p.name: CircuitBreaker(clock=clock) for p in self.providers}
+        self.stats = {p.name: ProviderStats() for p in self.providers}
+        self.last_snapshot = None
+        self.last_provider = None
+        self._lock = threading.Lock()
+
+    def fetch(self, location=''):
+        # Runs on a worker thread. Returns a snapshot from the first healthy provider that
+        # answers, or None when every provider failed or is cooling down.
+        client = self.client
+        if client is None:
+            from http_client import shared_client
+            client = shared_client()
+        for provider in self.providers:
+            breaker, stats = self.breakers[provider.name], self.stats[provider.name]
+            with self._lock:
+                if not breaker.allow():
+                    continue
+                timeout = stats.timeout()
+            start = time.perf_counter()
+            retry_after = 0.0
+            try:
+                snapshot = provider.fetch(client, location, timeout, self.last_snapshot)
+                error = '' if snapshot is not None else 'no usable data'
+            except RateLimited as e:
+                snapshot, error, retry_after = None, f"rate limited for {e.retry_after:.0f} s: {e}", e.retry_after
+            except Exception as e:
+                snapshot, error = None, f"{type(e).__name__}: {e}"
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                if snapshot is not None:
+                    stats.successes += 1
+                    stats.latencies_ms.append(elapsed_ms)
+                    breaker.record_success()
+                    self.last_snapshot, self.last_provider = snapshot, provider.name
+                    return snapshot
+                stats.failures += 1
+                stats.last_error = error
+                breaker.record_failure(retry_after)
+            print(f"Weather provider {provider.name} failed after {elapsed_ms:.0f} ms: {error}")
+        return None
+
+    def retry_in(self):
+        # Seconds until some provider accepts requests again; 0 unless every circuit is open.
+        # The scheduler waits at least this long, which is how Retry-After reaches it
+        with self._lock:
+            return min((self.breakers[p.name].retry_in() for p in self.providers), default=0.0)
+
+    def status(self):
+        # Per-provider health, included in the --profile report
+        with self._lock:
+            return {
+                p.name: {
+                    'state': self.breakers[p.name].state,
+                    'retry_in_s': round(self.breakers[p.name].retry_in(), 1),
+                    'successes': self.stats[p.name].successes,
+                    'failures': self.stats[p.name].failures,
+                    'p95_ms': self.stats[p.name].p95_ms(),
+                    'timeout_s': self.stats[p.name].timeout(),
+                    'last_error': self.stats[p.name].last_error,
+                }
+                for p in self.providers
+            }
@@ -0,0 +1,145 @@
+# python
+# When to refresh the weather
+# While the island is open the weather is kept fresh; revealing it refreshes right away if the
+# last good fetch is stale. While it stays hidden the refresh interval doubles after each
+# refresh, so an island nobody looks at makes a handful of requests a day instead of one every
+# ten minutes. Failures back off exponentially with jitter, and for at least as long as the
+# providers' circuit breakers need.
+
+import time
+import random
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+VISIBLE_INTERVAL = 300        # seconds between refreshes while the island is open
+HIDDEN_INTERVAL = 1800        # first refresh interval after the island is hidden
+MAX_HIDDEN_INTERVAL = 4 * 3600
+RETRY_BASE = 30               # first retry after a failure, doubling per consecutive failure
+MAX_RETRY = 900
+
+
+class RefreshScheduler(QObject):
+    refresh = pyqtSignal()
+    rescheduled = pyqtSignal()
+
+    def __init__(self, parent=None, fresh_for=VISIBLE_INTERVAL, visible_interval=VISIBLE_INTERVAL,
+                 hidden_interval=HIDDEN_INTERVAL, max_hidden_interval=MAX_HIDDEN_INTERVAL,
+                 retry_base=RETRY_BASE, max_retry=MAX_RETRY, clock=time.monotonic, rng=random.random):
+        super().__init__(parent)
+        self.fresh_for = fresh_for
+        self.visible_interval = visible_interval
+        self.hidden_interval = hidden_interval
+        self.max_hidden_interval = max_hidden_interval
+        self.retry_base = retry_base
+        self.max_retry = max_retry
+        self.clock = clock
+        self.rng = rng
+        self.shown_by = set()       # islands currently open; one scheduler can serve several
+        self.failures = 0
+        self.hidden_refreshes = 0   # refreshes since the island was last open
+        self.last_success = None    # clock() of the last good refresh
+        self.in_flight = False
+        self.started = False
+        self._due_at = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timer)
+
+    def start(self):
+        # Refreshes now if there is nothing fresh yet, otherwise waits for the next interval
+        self.started = True
+        if self.is_stale():
+            self.refresh_now()
+        else:
+            self._schedule()
+
+    def note_success_age(self, age):
+        # Seeds the schedule from a persisted snapshot that is already age seconds old
+        self.last_success = self.clock() - age
+
+    @property
+    def visible(self):
+        return bool(self.shown_by)
+
+    def island_shown(self, island=None):
+        self.shown_by.add(island)
+        self.hidden_refreshes = 0
+        if (not self.started or self.is_stale()) and not self.backing_off():
+            self.started = True
+            self.refresh_now()
+        elif self.started and not self.in_flight:
+            self._schedule()
+
+    def island_hidden(self, island=None):
+        if island not in self.shown_by:
+            return
+        self.shown_by.discard(island)
+        if self.started and not self.in_flight:
+            self._schedule()
+
+    def refresh_if_stale(self):
+        if self.is_stale() and not self.backing_off():
+            self.refresh_now()
+
+    def refresh_now(self):
+        if self.in_flight:
+            return
+        self.in_flight = True
+        self._timer.stop()
+        self._due_at = None
+        self.refresh.emit()
+
+    def record_result(self, ok, retry_after=0.0):
+        # Called when a refresh finishes; retry_after is the providers' own cool-down, if any
+        self.in_flight = False
+        if ok:
+            self.failures = 0
+            self.last_success = self.clock()
+        else:
+            self.failures += 1
+        self._schedule(retry_after)
+
+    def is_stale(self):
+        return self.last_success is None or self.clock() - self.last_success > self.fresh_for
+
+    def backing_off(self):
+        return self.failures > 0 and self._due_at is not None and self._due_at > self.clock()
+
+    def next_refresh_in(self):
+        # Seconds until the next scheduled refresh, or None if nothing is scheduled
+        if self._due_at is None:
+            return None
+        return max(0.0, self._due_at - self.clock())
+
+    def status_text(self):
+        delay = self.next_refresh_in()
+        if self.in_flight:
+            when = "refreshing now"
+        elif delay is None:
+            when = "no refresh scheduled"
+        else:
+            when = f"next refresh at {time.strftime('%H:%M:%S', time.localtime(time.time() + delay))}"
+        mode = 'open' if self.visible else 'hidden'
+        return f"Weather: {when} (island {mode}, {self.failures} failed attempts)"
+
+    def _on_timer(self):
+        if not self.visible:
+            self.hidden_refreshes += 1
+        self.refresh_now()
+
+    def _delay(self, retry_after=0.0):
+        if self.failures:
+            backoff = min(self.max_retry, self.retry_base * 2 ** (self.failures - 1))
+            # Jitter keeps many islands behind one IP from retrying in lockstep
+            return max(retry_after, backoff * (0.5 + 0.5 * self.rng()))
+        if self.visible:
+            interval = self.visible_interval
+        else:
+            interval = min(self.max_hidden_interval, self.hidden_interval * 2 ** self.hidden_refreshes)
+        since = self.clock() - self.last_success if self.last_success is not None else interval
+        return max(retry_after, interval - since, 0.0)
+
+    def _schedule(self, retry_after=0.0):
+        delay = self._delay(retry_after)
+        self._due_at = self.clock() + delay
+        self._timer.start(int(delay * 1000))
+        self.rescheduled.emit()
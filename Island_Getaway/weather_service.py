@@ -0,0 +1,119 @@
+# python
+# Background weather fetching for the Dynamic Island
+# Network requests run on a worker pool and results come back to the GUI thread through signals
+
+import time
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from app_paths import data_path
+from weather_cache import WeatherCache, DEFAULT_TTL, DEFAULT_MAX_STALE, save_snapshot, load_snapshot
+from weather_providers import ProviderChain
+
+# Cache key for snapshots; every provider produces the same WeatherSnapshot shape
+WEATHER_FORMAT = 'snapshot'
+SNAPSHOT_FILE = 'weather.json'
+
+
+def fetch_weather_snapshot(location='', providers=None):
+    # One request per refresh, failing over between providers.
+    # Runs on a worker thread, so the networking stack is only imported there.
+    return (providers or ProviderChain()).fetch(location)
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class _FetchTask(QRunnable):
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            print(f"Weather error: {e}")
+            result = None
+        self.signals.finished.emit(result)
+
+
+class WeatherService(QObject):
+    # Emits a WeatherSnapshot, or None when no weather could be fetched
+    snapshot_ready = pyqtSignal(object)
+    # Emitted once per request_snapshot() call that was not coalesced: True if fresh data came
+    # from the cache or a provider, False if every provider failed
+    refresh_finished = pyqtSignal(bool)
+
+    def __init__(self, parent=None, location='', ttl=DEFAULT_TTL, max_stale=DEFAULT_MAX_STALE,
+                 snapshot_path=None, providers=None):
+        super().__init__(parent)
+        self.location = location
+        self.providers = providers or ProviderChain()
+        self.cache = WeatherCache(ttl=ttl, max_stale=max_stale)
+        self.snapshot_path = snapshot_path or data_path(SNAPSHOT_FILE)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._in_flight = {}
+
+    def load_persisted(self):
+        # Last good snapshot from disk, used to paint the label before any network I/O.
+        # It also seeds the in-memory cache so a quick restart skips the fetch entirely.
+        snapshot = load_snapshot(self.snapshot_path, self.location)
+        if snapshot is not None:
+            # Providers that need coordinates start from the last known position
+            self.providers.last_snapshot = snapshot
+            age = time.time() - snapshot.fetched_at
+            if age <= self.cache.max_stale:
+                self.cache.store(self.location, WEATHER_FORMAT, snapshot, age=age)
+        return snapshot
+
+    def current(self):
+        # Latest snapshot still within max_stale, without triggering a fetch
+        return self.cache.lookup(self.location, WEATHER_FORMAT)[0]
+
+    def request_snapshot(self):
+        # Fresh entries are answered from the cache; stale ones are shown right away
+        # and revalidated in the background
+        cached, fresh = self.cache.lookup(self.location, WEATHER_FORMAT)
+        if cached is not None:
+            self.snapshot_ready.emit(cached)
+            if fresh:
+                self.refresh_finished.emit(True)
+                return
+        key = (self.location, WEATHER_FORMAT)
+        # Coalesce: while a fetch for this key is running, later requests just wait for it
+        if key in self._in_flight:
+            return
+        location = self.location
+        snapshot_path = self.snapshot_path
+        providers = self.providers
+
+        def fetch():
+            snapshot = fetch_weather_snapshot(location, providers)
+            if snapshot is not None:
+                try:
+                    save_snapshot(snapshot_path, location, snapshot)
+                except OSError as e:
+                    print(f"Weather cache write failed: {e}")
+            return snapshot
+
+        task = _FetchTask(fetch)
+        task.setAutoDelete(False)
+        self._in_flight[key] = task
+
+        def deliver(snapshot):
+            self._in_flight.pop(key, None)
+            if snapshot is not None:
+                self.cache.store(location, WEATHER_FORMAT, snapshot)
+                self.snapshot_ready.emit(snapshot)
+            elif self.cache.lookup(location, WEATHER_FORMAT)[0] is None:
+                self.snapshot_ready.emit(None)
+            self.refresh_finished.emit(snapshot is not None)
+
+        task.signals.finished.connect(deliver)
+        self.pool.start(task)
+
+    def shutdown(self, timeout_ms=1000):
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)